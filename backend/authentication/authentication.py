@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+USER_CACHE_KEY = 'auth:user:{user_id}'
+CACHED_USER_FIELDS = {
+    'id', 'username', 'email', 'first_name', 'last_name',
+    'is_active', 'is_staff', 'is_superuser', 'last_login', 'date_joined',
+}
+
+
+def invalidate_cached_user(user_id):
+    """Forget the cached copy of a user so the next request reloads it"""
+    cache.delete(USER_CACHE_KEY.format(user_id=user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that serves the request user from a short-lived cache
+
+    Only active users are cached, and saving or deleting a user evicts the
+    entry (see authentication.signals), so deactivation takes effect on the
+    next request in this process and within AUTH_USER_CACHE_TIMEOUT elsewhere
+    when the cache is not shared. The password hash is never cached; the
+    user object defers it and loads it only if something reads it.
+    """
+    
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        
+        key = USER_CACHE_KEY.format(user_id=user_id)
+        field_names = [
+            field.attname for field in self.user_model._meta.concrete_fields
+            if field.attname in CACHED_USER_FIELDS
+        ]
+        values = cache.get(key)
+        if values is None:
+            user = super().get_user(validated_token)
+            cache.set(key, [getattr(user, name) for name in field_names], settings.AUTH_USER_CACHE_TIMEOUT)
+            return user
+        return self.user_model.from_db(router.db_for_read(self.user_model), field_names, values)
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 hasher whose work factor comes from PASSWORD_HASH_ITERATIONS
+
+    Stored hashes keep the algorithm name pbkdf2_sha256, so changing the
+    setting upgrades each password transparently the next time its owner
+    logs in (must_update compares the stored iteration count).
+    """
+    
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
@@ -0,0 +1,71 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class HashingUnavailable(APIException):
+    """Raised when the hashing pool is too busy to finish within PASSWORD_HASHING_TIMEOUT"""
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('Password hashing is busy; try again shortly.')
+    default_code = 'hashing_unavailable'
+    
+    def __init__(self, wait, detail=None, code=None):
+        super().__init__(detail, code)
+        # DRF's exception handler sends `wait` as the Retry-After header.
+        self.wait = wait
+
+
+def get_hashing_executor():
+    """Return the process-wide pool that runs password hashing"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_WORKERS,
+                thread_name_prefix='password-hashing',
+            )
+    return _executor
+
+
+def run_hashing(func, *args):
+    """Run a CPU-bound hashing call on the bounded pool and wait for its result
+
+    hashlib releases the GIL while hashing, so request threads keep serving
+    other work while at most PASSWORD_HASHING_WORKERS hashes run at once.
+    Only pure hashing runs on the pool; database access stays on the caller.
+    A call still waiting after PASSWORD_HASHING_TIMEOUT raises HashingUnavailable.
+    """
+    future = get_hashing_executor().submit(func, *args)
+    try:
+        return future.result(timeout=settings.PASSWORD_HASHING_TIMEOUT)
+    except TimeoutError:
+        # Still queued behind other hashes: drop it rather than hash for nobody.
+        future.cancel()
+        raise HashingUnavailable(wait=max(settings.PASSWORD_HASHING_TIMEOUT, 1))
+
+
+def _verify(raw_password, encoded):
+    upgrade = []
+    is_correct = hashers.check_password(raw_password, encoded, setter=upgrade.append)
+    return is_correct, bool(upgrade)
+
+
+def make_password(raw_password):
+    """Hash a password on the pool"""
+    return run_hashing(hashers.make_password, raw_password)
+
+
+def check_password(user, raw_password):
+    """Verify a user's password on the pool, rehashing it if the hasher profile changed"""
+    is_correct, must_update = run_hashing(_verify, raw_password, user.password)
+    if is_correct and must_update:
+        user.password = make_password(raw_password)
+        user.save(update_fields=['password'])
+    return is_correct
@@ -0,0 +1,71 @@
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from authentication.hashing import make_password
+from authentication.models import User
+
+
+class Command(BaseCommand):
+    help = 'Measure login throughput and latency at increasing numbers of concurrent users'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 5, 10, 20],
+                            help='Concurrent user counts to measure')
+        parser.add_argument('--logins', type=int, default=5,
+                            help='Logins per user at each concurrency level')
+        parser.add_argument('--host', default='localhost',
+                            help='Host header for the requests (must be in ALLOWED_HOSTS)')
+
+    def handle(self, *args, **options):
+        if min(options['concurrency']) < 1 or options['logins'] < 1:
+            raise CommandError('--concurrency and --logins must be positive')
+        self.host = options['host']
+        self.password = uuid.uuid4().hex
+        prefix = f'bench-login-{uuid.uuid4().hex[:8]}'
+        encoded = make_password(self.password)
+        users = User.objects.bulk_create([
+            User(username=f'{prefix}-{n}', email=f'{prefix}-{n}@example.com', password=encoded)
+            for n in range(max(options['concurrency']))
+        ])
+        try:
+            self.stdout.write(f'{"users":>6} {"logins":>7} {"per sec":>9} {"p50 ms":>8} {"p95 ms":>8} {"failed":>7}')
+            for concurrency in options['concurrency']:
+                self.measure(users[:concurrency], options['logins'])
+        finally:
+            User.objects.filter(username__startswith=f'{prefix}-').delete()
+
+    def measure(self, users, logins):
+        """Log every user in `logins` times in parallel and print one result row"""
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(users)) as pool:
+            results = list(pool.map(lambda user: self.login(user.username, logins), users))
+        elapsed = time.perf_counter() - started
+        timings = sorted(t for user_timings, _ in results for t in user_timings)
+        failed = sum(user_failed for _, user_failed in results)
+        percentiles = statistics.quantiles(timings, n=100) if len(timings) > 1 else timings * 99
+        self.stdout.write(
+            f'{len(users):>6} {len(timings):>7} {len(timings) / elapsed:>9.1f} '
+            f'{percentiles[49] * 1000:>8.1f} {percentiles[94] * 1000:>8.1f} {failed:>7}'
+        )
+
+    def login(self, username, logins):
+        """Run one simulated user's logins; return (timings, failures)"""
+        client = Client(HTTP_HOST=self.host)
+        timings, failed = [], 0
+        try:
+            for _ in range(logins):
+                started = time.perf_counter()
+                response = client.post(
+                    reverse('login'), {'username': username, 'password': self.password},
+                    content_type='application/json',
+                )
+                timings.append(time.perf_counter() - started)
+                failed += response.status_code != 200
+        finally:
+            connection.close()
+        return timings, failed
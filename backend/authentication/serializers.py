@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
+from .hashing import make_password
 from .models import User
 
 class UserSerializer(serializers.ModelSerializer):
@@ -27,9 +28,15 @@ class RegisterSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         validated_data.pop('password_confirm')
-        validated_data['first_name'] = 'User'
-        validated_data['last_name'] = 'Name'
-        user = User.objects.create_user(**validated_data)
+        password = validated_data.pop('password')
+        user = User(
+            username=User.normalize_username(validated_data['username']),
+            email=User.objects.normalize_email(validated_data['email']),
+            first_name='User',
+            last_name='Name',
+        )
+        user.password = make_password(password)
+        user.save()
         return user
 
 
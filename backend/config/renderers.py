@@ -0,0 +1,50 @@
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Hand every type orjson would format differently from DRF (datetimes,
+# dataclasses) to DRF's encoder, so documents match JSONRenderer's.
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+
+encode_default = JSONEncoder().default
+
+
+def dumps(data):
+    """Encode data as compact UTF-8 JSON, with the same values as DRF's JSONEncoder"""
+    return orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer backed by orjson
+
+    Falls back to the stdlib encoder for anything orjson can't express
+    the same way: indents other than 2, non-compact or ASCII-only settings.
+    """
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if indent not in (None, 2) or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        option = ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+        ret = orjson.dumps(data, default=encode_default, option=option)
+        # Same escaping as JSONRenderer, for JSONP-style embedding.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Render responses as MessagePack, with the values the JSON renderer would produce"""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_default, use_bin_type=True, datetime=False)
@@ -52,10 +52,12 @@ INSTALLED_APPS = [
     
     'authentication',
     'leads',
+    'monitoring',
 ]
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'monitoring.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -63,6 +65,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'monitoring.profiling.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -84,6 +87,11 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
+
+# Route lead reads, analytics and the dashboard to leads.async_views.
+# config.asgi turns this on; WSGI deployments keep the sync views.
+ASYNC_VIEWS = config('ASYNC_VIEWS', cast=bool, default=False)
 
 
 # Database
@@ -130,6 +138,24 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+AUTHENTICATION_BACKENDS = [
+    'authentication.backends.PooledModelBackend',
+]
+
+# Password hashing runs on a bounded thread pool (authentication.hashing);
+# changing PASSWORD_HASH_ITERATIONS rehashes each password on its next login.
+PASSWORD_HASHERS = [
+    'authentication.hashers.ConfigurablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+PASSWORD_HASH_ITERATIONS = config('PASSWORD_HASH_ITERATIONS', cast=int, default=600000)
+PASSWORD_HASHING_WORKERS = config('PASSWORD_HASHING_WORKERS', cast=int, default=2)
+PASSWORD_HASHING_TIMEOUT = config('PASSWORD_HASHING_TIMEOUT', cast=int, default=30)
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -148,6 +174,10 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Uploaded and generated files (lead import error reports)
+MEDIA_URL = 'media/'
+MEDIA_ROOT = config('MEDIA_ROOT', default=str(BASE_DIR / 'media'))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -156,15 +186,58 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    # orjson for application/json and MessagePack for application/msgpack,
+    # chosen by Accept / Content-Type; both carry the same values.
+    'DEFAULT_RENDERER_CLASSES': [
+        'config.renderers.ORJSONRenderer',
+        'config.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'config.parsers.ORJSONParser',
+        'config.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+# Cache
+# Per-user data versions live here, so multi-process deployments need a
+# shared backend (e.g. django.core.cache.backends.redis.RedisCache). The
+# LocMemCache default is only correct with a single worker process;
+# `manage.py check --deploy` warns about it (leads.W001).
+CACHE_BACKEND = config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache')
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': config('CACHE_LOCATION', default='lead-management'),
+    }
+}
+if CACHE_BACKEND == 'django.core.cache.backends.locmem.LocMemCache':
+    # Least recently used entries are culled once the cache is full.
+    CACHES['default']['OPTIONS'] = {
+        'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', cast=int, default=5000),
+    }
+
+# Leads
+ANALYTICS_CACHE_TIMEOUT = config('ANALYTICS_CACHE_TIMEOUT', cast=int, default=300)
+LIST_CACHE_TIMEOUT = config('LIST_CACHE_TIMEOUT', cast=int, default=300)
+LEAD_DETAIL_ACTIVITY_LIMIT = config('LEAD_DETAIL_ACTIVITY_LIMIT', cast=int, default=20)
+LEAD_IMPORT_BATCH_SIZE = config('LEAD_IMPORT_BATCH_SIZE', cast=int, default=500)
+LEAD_EXPORT_CHUNK_SIZE = config('LEAD_EXPORT_CHUNK_SIZE', cast=int, default=2000)
+LEAD_BULK_ACTION_LIMIT = config('LEAD_BULK_ACTION_LIMIT', cast=int, default=5000)
+ACTIVITY_BATCH_LIMIT = config('ACTIVITY_BATCH_LIMIT', cast=int, default=1000)
+ACTIVITY_REPORT_MAX_DAYS = config('ACTIVITY_REPORT_MAX_DAYS', cast=int, default=366)
+LEAD_ARCHIVE_RETENTION_DAYS = config('LEAD_ARCHIVE_RETENTION_DAYS', cast=int, default=90)
+LEAD_ARCHIVE_BATCH_SIZE = config('LEAD_ARCHIVE_BATCH_SIZE', cast=int, default=500)
+
 # JWT Settings
 from datetime import timedelta
 
@@ -174,6 +247,9 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
 }
 
+# Seconds an authenticated user is served from cache instead of the users table
+AUTH_USER_CACHE_TIMEOUT = config('AUTH_USER_CACHE_TIMEOUT', cast=int, default=60)
+
 # CORS Settings
 CORS_ALLOWED_ORIGINS = config(
     'CORS_ALLOWED_ORIGINS',
@@ -185,3 +261,28 @@ CORS_ALLOW_CREDENTIALS = config('CORS_ALLOW_CREDENTIALS', cast=bool, default=Tru
 
 # Custom User Model
 AUTH_USER_MODEL = 'authentication.User'
+
+# Monitoring
+# Requests under these prefixes get a Server-Timing header and feed the
+# Prometheus histograms at /metrics (kept per process).
+REQUEST_METRICS_PATHS = ['/api/']
+SLOW_REQUEST_MS = config('SLOW_REQUEST_MS', cast=int, default=500)
+SLOW_REQUEST_SQL_LIMIT = config('SLOW_REQUEST_SQL_LIMIT', cast=int, default=10)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Staff requests sent with `X-Profile: 1` or `?profile=1` are profiled into
+# this directory; only the newest PROFILE_STORE_MAX_FILES are kept.
+PROFILE_STORE_DIR = config('PROFILE_STORE_DIR', default=str(BASE_DIR / 'profiles'))
+PROFILE_STORE_MAX_FILES = config('PROFILE_STORE_MAX_FILES', cast=int, default=50)
+PROFILE_REPORT_LINES = config('PROFILE_REPORT_LINES', cast=int, default=60)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'monitoring': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
@@ -17,6 +17,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from django.http import JsonResponse
+from monitoring.views import metrics_view
 
 def home(_request):
     return JsonResponse({"service": "lead-management-api", "status": "ok"})
@@ -26,4 +27,6 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('authentication.urls')),
     path('api/', include('leads.urls')),
+    path('api/profiles/', include('monitoring.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
\ No newline at end of file
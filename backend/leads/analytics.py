@@ -0,0 +1,76 @@
+import asyncio
+from django.conf import settings
+from django.core.cache import cache
+from .cache import aget_data_version, get_data_version
+from .concurrency import run_query
+from .models import Activity, LeadStats
+from .serializers import ActivitySerializer
+
+ANALYTICS_CACHE_KEY = 'leads:analytics:{user_id}:{version}'
+
+
+def get_lead_analytics(user):
+    """Return the dashboard metrics for a user, cached until their data changes"""
+    key = ANALYTICS_CACHE_KEY.format(user_id=user.pk, version=get_data_version(user.pk))
+    data = cache.get(key)
+    if data is None:
+        data = compute_lead_analytics(user)
+        cache.set(key, data, settings.ANALYTICS_CACHE_TIMEOUT)
+    return data
+
+
+async def aget_lead_analytics(user):
+    """Async variant of get_lead_analytics that runs its two queries concurrently"""
+    key = ANALYTICS_CACHE_KEY.format(user_id=user.pk, version=await aget_data_version(user.pk))
+    data = await cache.aget(key)
+    if data is None:
+        status_data, activities = await asyncio.gather(
+            run_query(LeadStats.objects.counts_for, user),
+            run_query(lambda: ActivitySerializer(recent_activities(user), many=True).data),
+        )
+        data = build_lead_analytics(status_data, activities)
+        await cache.aset(key, data, settings.ANALYTICS_CACHE_TIMEOUT)
+    return data
+
+
+def compute_lead_analytics(user):
+    """Compute the dashboard metrics for a user from the LeadStats rollup"""
+    return build_lead_analytics(
+        LeadStats.objects.counts_for(user),
+        ActivitySerializer(recent_activities(user), many=True).data,
+    )
+
+
+def recent_activities(user):
+    """Return the user's latest activities shown on the dashboard"""
+    return (
+        Activity.objects.filter(lead__is_deleted=False, lead__created_by=user)
+        .select_related('lead', 'created_by')
+        .order_by('-created_at')[:10]
+    )
+
+
+def build_lead_analytics(status_data, recent_activities):
+    """Assemble the dashboard payload from status counts and serialized activities"""
+    total_leads = sum(status_data.values())
+    qualified_leads = status_data.get('qualified', 0)
+    closed_leads = status_data.get('closed', 0)
+    lost_leads = status_data.get('lost', 0)
+
+    def rate(count):
+        return round(count / total_leads * 100, 1) if total_leads > 0 else 0
+
+    return {
+        'total_leads': total_leads,
+        'leads_by_status': status_data,
+        'recent_activities': recent_activities,
+        'conversion_metrics': {
+            'conversion_rate': rate(closed_leads),
+            'qualification_rate': rate(qualified_leads),
+            'lost_rate': rate(lost_leads),
+            'total_leads': total_leads,
+            'qualified_leads': qualified_leads,
+            'closed_leads': closed_leads,
+            'lost_leads': lost_leads
+        }
+    }
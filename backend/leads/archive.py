@@ -0,0 +1,104 @@
+from datetime import timedelta
+from django.db import IntegrityError, router, transaction
+from django.utils import timezone
+from .models import Activity, ActivityDailyRollup, ArchivedActivity, ArchivedLead, Lead
+
+
+class RestoreConflict(Exception):
+    """Raised when an archived lead cannot be restored over a live one"""
+
+
+def _shared_columns(source, target):
+    """Return the column attnames the two models have in common"""
+    target_columns = {field.attname for field in target._meta.concrete_fields}
+    return [field.attname for field in source._meta.concrete_fields if field.attname in target_columns]
+
+
+LEAD_COLUMNS = _shared_columns(Lead, ArchivedLead)
+ACTIVITY_COLUMNS = _shared_columns(Activity, ArchivedActivity)
+EMAIL_CONFLICT = 'An active lead with this email already exists.'
+
+
+def archive_cutoff(retention_days):
+    """Return the soft-delete time before which leads are due for archiving"""
+    return timezone.now() - timedelta(days=retention_days)
+
+
+def archivable_leads(cutoff):
+    """Return leads soft deleted before the cutoff"""
+    return Lead.objects.filter(is_deleted=True, deleted_at__lt=cutoff)
+
+
+def archive_leads(cutoff, batch_size=500):
+    """Move leads soft deleted before the cutoff, with their activities, into the archive tables
+
+    Each batch is copied and deleted in its own transaction, so a long run
+    never holds more than one batch of row locks. Returns the number of
+    leads and activities archived.
+    """
+    using = router.db_for_write(Lead)
+    archived_leads = archived_activities = 0
+    while True:
+        with transaction.atomic(using=using):
+            lead_ids = list(
+                archivable_leads(cutoff).select_for_update().order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not lead_ids:
+                break
+            leads = list(Lead.objects.filter(pk__in=lead_ids).values(*LEAD_COLUMNS))
+            activities = Activity.objects.filter(lead_id__in=lead_ids).values(*ACTIVITY_COLUMNS)
+            now = timezone.now()
+            ArchivedLead.objects.bulk_create(
+                [ArchivedLead(archived_at=now, **row) for row in leads], batch_size=batch_size
+            )
+            created = ArchivedActivity.objects.bulk_create(
+                [ArchivedActivity(**row) for row in activities], batch_size=batch_size
+            )
+            # The delete cascades to the activities; its signals drop the leads from
+            # the search index and invalidate their owners' caches.
+            Lead.objects.using(using).filter(pk__in=lead_ids).delete()
+        archived_leads += len(lead_ids)
+        archived_activities += len(created)
+    return archived_leads, archived_activities
+
+
+def restore_lead(archived):
+    """Move an archived lead and its activities back into the live tables as a live lead
+
+    The archived row is locked first, so of two concurrent restores the
+    second raises ArchivedLead.DoesNotExist once the first commits.
+    """
+    using = router.db_for_write(Lead)
+    with transaction.atomic(using=using):
+        archived = ArchivedLead.objects.using(using).select_for_update().get(pk=archived.pk)
+        if Lead.objects.filter(is_active=True, email=archived.email).exists():
+            raise RestoreConflict(EMAIL_CONFLICT)
+        lead = Lead(**{column: getattr(archived, column) for column in LEAD_COLUMNS})
+        lead.is_active = True
+        lead.is_deleted = False
+        lead.deleted_at = None
+        try:
+            # save() keeps LeadStats, the search index and caches in step.
+            with transaction.atomic(using=using):
+                lead.save(force_insert=True)
+        except IntegrityError:
+            # A live lead claimed the email after the check above.
+            raise RestoreConflict(EMAIL_CONFLICT)
+        archived_activities = list(archived.activities.all())
+        activities = Activity.objects.bulk_create(
+            [
+                Activity(**{column: getattr(activity, column) for column in ACTIVITY_COLUMNS})
+                for activity in archived_activities
+            ],
+            batch_size=500,
+        )
+        # auto_now_add overwrote the original timestamps on insert; put them back.
+        lead.created_at = archived.created_at
+        Lead.objects.filter(pk=lead.pk).update(created_at=archived.created_at)
+        for activity, original in zip(activities, archived_activities):
+            activity.created_at = original.created_at
+            activity.updated_at = original.updated_at
+        Activity.objects.bulk_update(activities, ['created_at', 'updated_at'], batch_size=500)
+        ActivityDailyRollup.objects.add_activities(activities)
+        archived.delete()
+    return lead
@@ -0,0 +1,154 @@
+import asyncio
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import InvalidPage
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from .analytics import aget_lead_analytics
+from .cache import aget_data_version
+from .concurrency import run_query
+from .views import LeadViewSet, dashboard
+
+
+def async_viewset_view(viewset_class, actions, handlers, sync_view=None, **initkwargs):
+    """Build an async view serving `handlers` itself and every other action synchronously
+
+    Handlers are coroutines taking (viewset, request, *args, **kwargs). They
+    run between the viewset's usual initial() checks and finalize_response(),
+    exactly as DRF's dispatch() would run the sync action.
+    """
+    if 'get' in actions and 'head' not in actions:
+        actions = {**actions, 'head': actions['get']}
+    sync_view = sync_to_async(sync_view or viewset_class.as_view(actions, **initkwargs))
+    
+    async def view(request, *args, **kwargs):
+        action = actions.get(request.method.lower())
+        if action not in handlers:
+            return await sync_view(request, *args, **kwargs)
+        viewset = viewset_class(**initkwargs)
+        viewset.action_map = actions
+        viewset.args, viewset.kwargs = args, kwargs
+        request = viewset.initialize_request(request, *args, **kwargs)
+        viewset.request = request
+        viewset.headers = viewset.default_response_headers
+        try:
+            await sync_to_async(viewset.initial)(request, *args, **kwargs)
+            response = await handlers[action](viewset, request, *args, **kwargs)
+        except Exception as exc:
+            response = viewset.handle_exception(exc)
+        viewset.response = viewset.finalize_response(request, response, *args, **kwargs)
+        return viewset.response
+    
+    view.csrf_exempt = True
+    return view
+
+
+async def paginate(viewset, queryset):
+    """Fetch one page, counting the total concurrently when page numbers are in use"""
+    request = viewset.request
+    paginator = viewset.paginator
+    page_size = paginator.get_page_size(request) if paginator is not None else None
+    if not page_size:
+        return await run_query(list, queryset), False
+    if not isinstance(paginator, PageNumberPagination):
+        # Cursor pages need no count; there is nothing to overlap.
+        return await sync_to_async(paginator.paginate_queryset)(queryset, request, viewset), True
+    
+    page_number = request.query_params.get(paginator.page_query_param) or 1
+    try:
+        page_number = int(page_number)
+    except (TypeError, ValueError):
+        page_number = 0
+    if page_number < 1:
+        # 'last' and invalid numbers need the count first; let DRF handle them.
+        return await sync_to_async(paginator.paginate_queryset)(queryset, request, viewset), True
+    
+    django_paginator = paginator.django_paginator_class(queryset, page_size)
+    offset = (page_number - 1) * page_size
+    _, rows = await asyncio.gather(
+        run_query(lambda: django_paginator.count),
+        run_query(list, queryset[offset:offset + page_size]),
+    )
+    try:
+        page = django_paginator.page(page_number)
+    except InvalidPage as exc:
+        raise NotFound(paginator.invalid_page_message.format(page_number=page_number, message=str(exc)))
+    page.object_list = rows
+    paginator.page = page
+    paginator.request = request
+    if paginator.template is not None and django_paginator.num_pages > 1:
+        paginator.display_page_controls = True
+    return rows, True
+
+
+async def list_leads(viewset, request, *args, **kwargs):
+    """LeadViewSet.list with the cache lookup, count and page fetched concurrently"""
+    queryset = viewset.filter_queryset(viewset.get_queryset())
+    cache_key = viewset.get_list_cache_key(request, await aget_data_version(request.user.pk))
+    entry = await cache.aget(cache_key)
+    if entry is not None:
+        response = viewset.cached_list_response(entry)
+    else:
+        row_serializer = viewset.get_row_serializer(queryset)
+        rows, paginated = await paginate(
+            viewset, row_serializer.values(queryset, *viewset.get_pagination_columns())
+        )
+        data = row_serializer.serialize(rows)
+        response = viewset.get_paginated_response(data) if paginated else Response(data)
+        entry = viewset.make_list_cache_entry(response)
+        if entry is not None:
+            await cache.aset(cache_key, entry, settings.LIST_CACHE_TIMEOUT)
+    return viewset.conditional_list_response(request, response)
+
+
+async def retrieve_lead(viewset, request, *args, **kwargs):
+    """LeadViewSet.retrieve with the ETag aggregate, lead and recent activities fetched concurrently"""
+    lookup_url_kwarg = viewset.lookup_url_kwarg or viewset.lookup_field
+    lookup = {viewset.lookup_field: kwargs[lookup_url_kwarg]}
+    serializer_class = viewset.get_serializer_class()
+    try:
+        leads, state, activities = await asyncio.gather(
+            run_query(list, viewset.filter_queryset(viewset.get_queryset()).filter(**lookup)),
+            run_query(viewset.get_conditional_state, viewset.get_queryset().filter(**lookup)),
+            run_query(list, serializer_class.recent_activities(kwargs[lookup_url_kwarg])),
+        )
+    except (TypeError, ValueError):
+        raise Http404
+    etag, last_modified = viewset.get_validators(request, state)
+    response = get_conditional_response(request._request, etag=etag)
+    if response is None:
+        if not leads:
+            raise Http404
+        viewset.check_object_permissions(request, leads[0])
+        context = {**viewset.get_serializer_context(), 'recent_activities': activities}
+        response = Response(serializer_class(leads[0], context=context).data)
+    return viewset.set_validators(response, etag, last_modified)
+
+
+async def lead_analytics(viewset, request, *args, **kwargs):
+    """LeadViewSet.analytics with its status counts and recent activities fetched concurrently"""
+    return Response(await aget_lead_analytics(request.user))
+
+
+lead_list = async_viewset_view(
+    LeadViewSet, {'get': 'list', 'post': 'create'}, {'list': list_leads},
+    basename='lead', detail=False,
+)
+lead_detail = async_viewset_view(
+    LeadViewSet,
+    {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'},
+    {'retrieve': retrieve_lead},
+    basename='lead', detail=True,
+)
+lead_analytics_view = async_viewset_view(
+    LeadViewSet, {'get': 'analytics'}, {'analytics': lead_analytics},
+    basename='lead', detail=False,
+)
+dashboard_view = async_viewset_view(
+    LeadViewSet, {'get': 'analytics'}, {'analytics': lead_analytics},
+    sync_view=dashboard, basename='lead', detail=False,
+)
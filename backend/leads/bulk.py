@@ -0,0 +1,86 @@
+from collections import Counter
+from django.db import router, transaction
+from django.utils import timezone
+from .models import Activity, ActivityDailyRollup, Lead, LeadStats
+from .search import remove_from_search_index, search_leads
+from .signals import bump_after_commit
+
+
+class BulkSelectionTooLarge(Exception):
+    """Raised when a bulk action would touch more leads than allowed"""
+
+
+def select_leads(queryset, ids=None, filters=None):
+    """Narrow a lead queryset by explicit ids or by the list endpoint's filters"""
+    if ids is not None:
+        return queryset.filter(pk__in=ids)
+    if filters.get('status'):
+        queryset = queryset.filter(status=filters['status'])
+    if filters.get('search'):
+        queryset = search_leads(queryset, filters['search'].replace(',', ' ').split())
+    return queryset
+
+
+def _lock_rows(queryset, limit):
+    """Lock the selected leads and return their (id, owner id, status) rows"""
+    rows = list(queryset.select_for_update().order_by().values_list('pk', 'created_by_id', 'status')[:limit + 1])
+    if len(rows) > limit:
+        raise BulkSelectionTooLarge(f'Bulk actions are limited to {limit} leads; narrow the selection.')
+    return rows
+
+
+def _invalidate_owners(rows):
+    """Bump the data version of every owner touched by a bulk action"""
+    for user_id in {user_id for _, user_id, _ in rows}:
+        bump_after_commit(user_id, router.db_for_write(Lead))
+
+
+def bulk_update_status(queryset, status, limit):
+    """Move the selected leads to a new status with a single UPDATE"""
+    with transaction.atomic():
+        rows = _lock_rows(queryset.exclude(status=status), limit)
+        if not rows:
+            return 0
+        updated = Lead.objects.filter(pk__in=[pk for pk, _, _ in rows]).update(
+            status=status, updated_at=timezone.now()
+        )
+        deltas = Counter()
+        for _, user_id, old_status in rows:
+            if user_id is not None:
+                deltas[(user_id, old_status)] -= 1
+                deltas[(user_id, status)] += 1
+        LeadStats.objects.apply_deltas(deltas)
+        _invalidate_owners(rows)
+    return updated
+
+
+def bulk_soft_delete(queryset, limit):
+    """Soft delete the selected leads with a single UPDATE"""
+    with transaction.atomic():
+        rows = _lock_rows(queryset.filter(is_deleted=False), limit)
+        if not rows:
+            return 0
+        lead_ids = [pk for pk, _, _ in rows]
+        ActivityDailyRollup.objects.add_lead_activities(lead_ids, sign=-1)
+        now = timezone.now()
+        deleted = Lead.objects.filter(pk__in=lead_ids).update(
+            is_deleted=True, is_active=False, deleted_at=now, updated_at=now
+        )
+        deltas = Counter()
+        for _, user_id, status in rows:
+            if user_id is not None:
+                deltas[(user_id, status)] -= 1
+        LeadStats.objects.apply_deltas(deltas)
+        remove_from_search_index(lead_ids)
+        _invalidate_owners(rows)
+    return deleted
+
+
+def bulk_create_activities(activities):
+    """Insert activities in batches, add them to the rollup and invalidate their lead owners' caches"""
+    with transaction.atomic():
+        created = Activity.objects.bulk_create(activities, batch_size=500)
+        ActivityDailyRollup.objects.add_activities(created)
+        for user_id in {activity.lead.created_by_id for activity in created}:
+            bump_after_commit(user_id, router.db_for_write(Activity))
+    return created
@@ -0,0 +1,89 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+from .conditional import data_digest
+
+DATA_VERSION_KEY = 'leads:data-version:{user_id}'
+LIST_CACHE_KEY = 'leads:list-page:{name}:{user_id}:{version}:{digest}'
+
+
+def get_data_version(user_id):
+    """Return the version of the user's leads and activities used in cache keys"""
+    key = DATA_VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        # Start from a fresh, never-before-used value so an evicted counter
+        # can't resurrect entries cached under an older version.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_data_version(user_id):
+    """Async variant of get_data_version"""
+    key = DATA_VERSION_KEY.format(user_id=user_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_data_version(user_id):
+    """Invalidate every cached view of the user's leads and activities"""
+    key = DATA_VERSION_KEY.format(user_id=user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+class CachedListMixin:
+    """Cache list responses per user, request URL and data version
+
+    Any write to the user's leads or activities bumps the data version (see
+    leads.signals), which orphans every cached page at once; LIST_CACHE_TIMEOUT
+    and the cache's own eviction only bound memory. Each entry stores the
+    digest of its page, so the ETag ConditionalGetMixin sends always comes
+    from the very body being served. Versions are only shared between
+    workers when the cache backend is (see leads.checks).
+    """
+    
+    def list(self, request, *args, **kwargs):
+        key = self.get_list_cache_key(request)
+        entry = cache.get(key)
+        if entry is not None:
+            return self.cached_list_response(entry)
+        response = super().list(request, *args, **kwargs)
+        entry = self.make_list_cache_entry(response)
+        if entry is not None:
+            cache.set(key, entry, settings.LIST_CACHE_TIMEOUT)
+        return response
+    
+    def cached_list_response(self, entry):
+        """Rebuild a list response from a cache entry, with the digest its ETag is built from"""
+        response = Response(entry['data'])
+        response.data_digest = entry['digest']
+        return response
+    
+    def make_list_cache_entry(self, response):
+        """Return the cache entry for a successful list response, or None"""
+        if response.status_code != 200:
+            return None
+        response.data_digest = data_digest(response.data)
+        return {'data': response.data, 'digest': response.data_digest}
+    
+    def get_list_cache_key(self, request, version=None):
+        """Build the cache key for this list request"""
+        if version is None:
+            version = get_data_version(request.user.pk)
+        # Pagination links are absolute, so the host is part of the key.
+        url = request.build_absolute_uri()
+        return LIST_CACHE_KEY.format(
+            name=self.basename,
+            user_id=request.user.pk,
+            version=version,
+            digest=hashlib.sha256(url.encode()).hexdigest()[:32],
+        )
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+PER_PROCESS_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Warn when the list and analytics caches cannot see other workers' writes"""
+    if settings.CACHES['default']['BACKEND'] not in PER_PROCESS_CACHES:
+        return []
+    return [
+        Warning(
+            'The default cache is private to each process, so data versions bumped by '
+            'one worker are invisible to the others and they keep serving cached lists '
+            'and analytics from before the write.',
+            hint='Run a single worker, or set CACHE_BACKEND to a shared backend such as '
+                 'django.core.cache.backends.redis.RedisCache.',
+            id='leads.W001',
+        )
+    ]
@@ -0,0 +1,21 @@
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+
+def _run_and_release(func, *args):
+    try:
+        return func(*args)
+    finally:
+        close_old_connections()
+
+
+async def run_query(func, *args):
+    """Run a blocking ORM call on a worker thread so independent queries can overlap
+
+    Django 4.2's async ORM (aget, acount, ...) sends every query to the single
+    thread-sensitive executor, so gathering several of them still runs them
+    one after another. Here each call gets a pooled worker thread and that
+    thread's own database connection, released under the usual CONN_MAX_AGE
+    rules once the call returns. Await these together with asyncio.gather.
+    """
+    return await sync_to_async(_run_and_release, thread_sensitive=False)(func, *args)
@@ -0,0 +1,85 @@
+import hashlib
+from datetime import datetime
+from django.core.exceptions import ValidationError
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from config.renderers import dumps
+
+
+def data_digest(data):
+    """Fingerprint serialized response data"""
+    return hashlib.sha256(dumps(data)).hexdigest()
+
+
+class ConditionalGetMixin:
+    """Answer list and retrieve with 304 Not Modified when the client's ETag is current
+
+    Retrieve validators come from one aggregate over the row the response is
+    built from (see get_conditional_aggregates), so nothing is serialized to
+    compute them. Last-Modified is sent for information only: it cannot see
+    rows leaving the result set, so only If-None-Match can yield a 304.
+    
+    List ETags are a digest of the page actually served, so they cost no
+    query beyond the page itself and always describe the body they go with.
+    """
+    
+    def get_conditional_aggregates(self):
+        """Return the aggregates whose values change whenever the retrieved object would"""
+        raise NotImplementedError
+    
+    def list(self, request, *args, **kwargs):
+        return self.conditional_list_response(request, super().list(request, *args, **kwargs))
+    
+    def conditional_list_response(self, request, response):
+        """Validate a list response against the ETag of the page it carries"""
+        if response.status_code != 200:
+            return response
+        # Cached responses carry the digest stored with them (see CachedListMixin).
+        digest = getattr(response, 'data_digest', None) or data_digest(response.data)
+        etag = quote_etag(self._etag_digest(request, {'data': digest}))
+        return self.set_validators(get_conditional_response(request._request, etag=etag) or response, etag, None)
+    
+    def retrieve(self, request, *args, **kwargs):
+        lookup = {self.lookup_field: kwargs[self.lookup_url_kwarg or self.lookup_field]}
+        try:
+            queryset = self.get_queryset().filter(**lookup)
+        except (TypeError, ValueError, ValidationError):
+            return super().retrieve(request, *args, **kwargs)
+        return self._conditional_response(queryset, super().retrieve, request, *args, **kwargs)
+    
+    def _conditional_response(self, queryset, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request, self.get_conditional_state(queryset))
+        response = get_conditional_response(request._request, etag=etag)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+    
+    def get_conditional_state(self, queryset):
+        """Run the fingerprint aggregate over the rows behind the response"""
+        return queryset.order_by().aggregate(**self.get_conditional_aggregates())
+    
+    def get_validators(self, request, state):
+        """Return the ETag and Last-Modified timestamp for a fingerprint"""
+        timestamps = [value for value in state.values() if isinstance(value, datetime)]
+        last_modified = max(timestamps).timestamp() if timestamps else None
+        return quote_etag(self._etag_digest(request, state)), last_modified
+    
+    def set_validators(self, response, etag, last_modified):
+        """Attach the validators and revalidation headers to a 200 or 304"""
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ('Accept', 'Authorization'))
+        return response
+    
+    def _etag_digest(self, request, state):
+        parts = [
+            request.user.pk,
+            request._request.path,
+            sorted(request.query_params.lists()),
+            getattr(request, 'accepted_media_type', None),
+            sorted((key, str(value)) for key, value in state.items()),
+        ]
+        return hashlib.sha256(repr(parts).encode()).hexdigest()[:40]
@@ -0,0 +1,71 @@
+import csv
+from collections import defaultdict
+from config.renderers import dumps
+from .models import Activity
+from .rows import RowSerializer
+from .serializers import ActivityListSerializer, LeadSerializer
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def iter_lead_rows(queryset, include_activities=False, chunk_size=2000):
+    """Yield serialized leads, streaming the queryset chunk by chunk"""
+    lead_rows = RowSerializer.for_queryset(LeadSerializer, queryset)
+    batch = []
+    for lead in lead_rows.values(queryset).iterator(chunk_size=chunk_size):
+        batch.append(lead)
+        if len(batch) >= chunk_size:
+            yield from serialize_batch(lead_rows, batch, include_activities)
+            batch = []
+    if batch:
+        yield from serialize_batch(lead_rows, batch, include_activities)
+
+
+def serialize_batch(lead_rows, leads, include_activities):
+    """Serialize a batch of lead rows, loading their activities in one query"""
+    rows = lead_rows.serialize(leads)
+    if include_activities:
+        activities_by_lead = defaultdict(list)
+        activities = Activity.objects.filter(lead_id__in=[lead['id'] for lead in leads]).with_display_names()
+        activity_rows = RowSerializer.for_queryset(ActivityListSerializer, activities)
+        for activity in activity_rows.serialize(activity_rows.values(activities)):
+            activities_by_lead[activity['lead']].append(activity)
+        for row in rows:
+            row['activities'] = activities_by_lead[row['id']]
+    return rows
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows, include_activities=False):
+    """Yield CSV lines; nested activities are embedded as a JSON column"""
+    fields = list(LeadSerializer.Meta.fields) + (['activities'] if include_activities else [])
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        if include_activities:
+            row['activities'] = dumps(row['activities']).decode()
+        yield writer.writerow([row[field] for field in fields])
+
+
+def stream_ndjson(rows):
+    """Yield one JSON document per line"""
+    for row in rows:
+        yield dumps(row) + b'\n'
+
+
+def stream_leads(queryset, file_format, include_activities=False, chunk_size=2000):
+    """Yield the export of a lead queryset in the requested format"""
+    rows = iter_lead_rows(queryset, include_activities, chunk_size)
+    if file_format == 'csv':
+        return stream_csv(rows, include_activities)
+    return stream_ndjson(rows)
@@ -0,0 +1,12 @@
+import django_filters
+from .models import Activity
+
+
+class ActivityFilter(django_filters.FilterSet):
+    """Filter activities by raw lead id, without loading the lead to validate it, and by date range"""
+    lead = django_filters.NumberFilter(field_name='lead_id')
+    date = django_filters.IsoDateTimeFromToRangeFilter()
+    
+    class Meta:
+        model = Activity
+        fields = ['activity_type', 'lead']
@@ -0,0 +1,184 @@
+import codecs
+import csv
+import json
+from collections import Counter
+from django.db import IntegrityError, router, transaction
+from .models import Lead, LeadStats
+from .search import sync_search_index
+from .serializers import LeadImportSerializer
+from .signals import bump_after_commit
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+REPORT_HEADER = ['line', 'field', 'error']
+# Readers yield this in place of a record whose bytes are not valid UTF-8.
+UNDECODABLE = object()
+
+
+class ImportFileError(Exception):
+    """Raised when an import file cannot be read at all"""
+
+
+def detect_format(filename):
+    """Guess the import format from a file name"""
+    name = (filename or '').lower()
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if name.endswith('.csv'):
+        return 'csv'
+    return None
+
+
+def decode_lines(lines, undecodable):
+    """Decode UTF-8 lines, adding the numbers of lines that are not valid UTF-8 to `undecodable`
+
+    Bad lines are decoded with replacement characters so parsing can go on;
+    callers reject the records they belong to.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if line_number == 1:
+            line = line.removeprefix(codecs.BOM_UTF8)
+        try:
+            yield line.decode('utf-8')
+        except UnicodeDecodeError:
+            undecodable.add(line_number)
+            yield line.decode('utf-8', errors='replace')
+
+
+def read_csv(lines):
+    """Yield (line number, row dict) from an iterable of encoded CSV lines"""
+    undecodable = set()
+    reader = csv.DictReader(decode_lines(lines, undecodable))
+    reader.fieldnames  # read the header so numbering starts after it
+    if undecodable:
+        raise ImportFileError('The header row is not valid UTF-8.')
+    last_line = reader.line_num
+    for row in reader:
+        # Quoted values can span lines; report the line the record starts on.
+        first_line = last_line + 1
+        last_line = reader.line_num
+        if any(first_line <= line_number <= last_line for line_number in undecodable):
+            yield first_line, UNDECODABLE
+        else:
+            yield first_line, row
+        undecodable.clear()
+
+
+def read_jsonl(lines):
+    """Yield (line number, row dict) from an iterable of encoded JSON lines"""
+    undecodable = set()
+    for line_number, line in enumerate(decode_lines(lines, undecodable), start=1):
+        if line_number in undecodable:
+            yield line_number, UNDECODABLE
+        elif not line.strip():
+            continue
+        else:
+            try:
+                yield line_number, json.loads(line)
+            except ValueError:
+                yield line_number, None
+
+
+READERS = {'csv': read_csv, 'jsonl': read_jsonl}
+
+
+class LeadImporter:
+    """Validate rows with LeadImportSerializer and insert them in batches"""
+
+    def __init__(self, user, batch_size=500, report=None, sample_size=50):
+        self.user = user
+        self.batch_size = batch_size
+        self.report = csv.writer(report) if report is not None else None
+        self.sample_size = sample_size
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+        self.seen_emails = {}
+        if self.report is not None:
+            self.report.writerow(REPORT_HEADER)
+
+    def run(self, rows):
+        """Import (line number, row) pairs; return a summary of the import"""
+        chunk = []
+        for line_number, row in rows:
+            chunk.append((line_number, row))
+            if len(chunk) >= self.batch_size:
+                self.import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.import_chunk(chunk)
+        return {'created': self.created, 'failed': self.failed, 'errors': self.errors}
+
+    def import_chunk(self, chunk):
+        """Validate, deduplicate and insert one chunk of rows"""
+        valid, rejected = [], []
+        for line_number, row in chunk:
+            if row is UNDECODABLE:
+                rejected.append((line_number, {'non_field_errors': ['Row is not valid UTF-8']}))
+                continue
+            if not isinstance(row, dict):
+                rejected.append((line_number, {'non_field_errors': ['Row is not a valid record']}))
+                continue
+            serializer = LeadImportSerializer(data=row)
+            if serializer.is_valid():
+                valid.append((line_number, serializer.validated_data))
+            else:
+                rejected.append((line_number, serializer.errors))
+
+        valid = self.deduplicate(valid, rejected)
+        for line_number, errors in sorted(rejected, key=lambda item: item[0]):
+            self.record_error(line_number, errors)
+        if not valid:
+            return
+        try:
+            with transaction.atomic(using=router.db_for_write(Lead)):
+                self.insert([data for _, data in valid])
+        except IntegrityError:
+            # A concurrent writer claimed one of the emails; retry row by row.
+            for line_number, data in valid:
+                try:
+                    with transaction.atomic(using=router.db_for_write(Lead)):
+                        self.insert([data])
+                except IntegrityError:
+                    self.record_error(line_number, {'email': ['A lead with this email already exists.']})
+
+    def deduplicate(self, valid, rejected):
+        """Reject rows whose email repeats in the file or belongs to an active lead"""
+        emails = {data['email'] for _, data in valid}
+        existing = set(
+            Lead.objects.filter(is_active=True, email__in=emails).values_list('email', flat=True)
+        )
+        unique = []
+        for line_number, data in valid:
+            email = data['email']
+            if email in self.seen_emails:
+                rejected.append((line_number, {'email': [f'Duplicate of line {self.seen_emails[email]}.']}))
+            elif email in existing:
+                rejected.append((line_number, {'email': ['A lead with this email already exists.']}))
+            else:
+                self.seen_emails[email] = line_number
+                unique.append((line_number, data))
+        return unique
+
+    def insert(self, rows):
+        """Bulk insert validated rows and update everything derived from leads"""
+        leads = Lead.objects.bulk_create(
+            [Lead(created_by=self.user, **data) for data in rows], batch_size=self.batch_size
+        )
+        LeadStats.objects.apply_deltas(Counter(lead.stats_key() for lead in leads))
+        sync_search_index(leads)
+        bump_after_commit(self.user.pk, router.db_for_write(Lead))
+        self.created += len(leads)
+
+    def record_error(self, line_number, errors):
+        """Count a rejected row and write it to the error report"""
+        self.failed += 1
+        errors = {
+            field: [str(message) for message in (messages if isinstance(messages, list) else [messages])]
+            for field, messages in errors.items()
+        }
+        if len(self.errors) < self.sample_size:
+            self.errors.append({'line': line_number, 'errors': errors})
+        if self.report is not None:
+            for field, messages in errors.items():
+                for message in messages:
+                    self.report.writerow([line_number, field, message])
@@ -0,0 +1,183 @@
+import json
+import re
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+from leads.cache import bump_data_version
+from leads.models import Activity, Lead
+
+# Django aliases tables in subqueries and repeated joins as U0, T3, ...
+TABLE_ALIAS = re.compile(r'(?:FROM|JOIN)\s+"(\w+)"(?:\s+(?:AS\s+)?"?([A-Z]\d+)\b)?')
+SQLITE_SCAN = re.compile(r'^SCAN (\w+)(.*)$')
+TRAILING_LIMIT = re.compile(r'\s+LIMIT\s+-?\d+(?:\s+OFFSET\s+\d+)?\s*$')
+
+
+class Command(BaseCommand):
+    help = ('EXPLAIN every query the lead and activity endpoints run for a user; '
+            'flag sequential scans and sorts over large tables')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', required=True, help='Username whose data the requests read')
+        parser.add_argument('--rows', type=int, default=1000,
+                            help='Flag scans and sorts touching at least this many rows (default: 1000)')
+        parser.add_argument('--analyze', action='store_true',
+                            help='Use EXPLAIN ANALYZE row counts on PostgreSQL (runs the queries)')
+        parser.add_argument('--host', default='localhost',
+                            help='Host header for the requests (must be in ALLOWED_HOSTS)')
+        parser.add_argument('--output', metavar='PATH', help='Write the JSON report to this file')
+        parser.add_argument('--fail-on-findings', action='store_true',
+                            help='Exit non-zero when any query is flagged')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            raise CommandError(f'EXPLAIN parsing is not supported on {connection.vendor}')
+        try:
+            self.user = get_user_model().objects.get(username=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist")
+        lead = Lead.objects.filter(created_by=self.user, is_deleted=False).first()
+        activity = Activity.objects.filter(lead__created_by=self.user, lead__is_deleted=False).first()
+        if lead is None or activity is None:
+            raise CommandError(f"User '{options['user']}' has no leads or activities; run seed_leads first")
+        self.threshold = options['rows']
+        self.analyze = options['analyze'] and connection.vendor == 'postgresql'
+        self.table_rows = {}
+        self.client = Client(HTTP_HOST=options['host'], HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+        endpoints = [
+            ('lead_list', '/api/leads/', {}),
+            ('lead_list_status', '/api/leads/', {'status': lead.status}),
+            ('lead_list_cursor', '/api/leads/', {'pagination': 'cursor'}),
+            ('lead_search', '/api/leads/', {'search': lead.last_name[:3]}),
+            ('lead_retrieve', f'/api/leads/{lead.pk}/', {}),
+            ('lead_activities', f'/api/leads/{lead.pk}/activities/', {}),
+            ('lead_export', '/api/leads/export/', {'file_format': 'ndjson', 'include_activities': 'true'}),
+            ('lead_archived', '/api/leads/archived/', {}),
+            ('lead_analytics', '/api/leads/analytics/', {}),
+            ('activity_list', '/api/activities/', {}),
+            ('activity_list_lead', '/api/activities/', {'lead': lead.pk}),
+            ('activity_list_type', '/api/activities/', {'activity_type': activity.activity_type}),
+            ('activity_retrieve', f'/api/activities/{activity.pk}/', {}),
+            ('activity_report', '/api/activities/report/', {'period': 'week'}),
+            ('dashboard', '/api/dashboard/', {}),
+        ]
+        report = {
+            'vendor': connection.vendor,
+            'user': self.user.username,
+            'threshold_rows': self.threshold,
+            'analyze': self.analyze,
+            'endpoints': [self.explain_endpoint(*endpoint) for endpoint in endpoints],
+        }
+        report['findings'] = sum(
+            len(query['findings']) for endpoint in report['endpoints'] for query in endpoint['queries']
+        )
+
+        self.summarize(report)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(f"Report written to {options['output']}")
+        if report['findings'] and options['fail_on_findings']:
+            raise CommandError(f"{report['findings']} finding(s) at or above {self.threshold} rows")
+
+    def explain_endpoint(self, name, path, params):
+        """Request an endpoint with a cold cache and EXPLAIN every SELECT it ran"""
+        bump_data_version(self.user.pk)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(path, params)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        queries = []
+        for query in captured.captured_queries:
+            sql = query['sql']
+            if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+                continue
+            plan, findings = self.explain(sql)
+            queries.append({'sql': sql, 'plan': plan, 'findings': findings})
+        return {'name': name, 'path': path, 'params': params, 'status': response.status_code, 'queries': queries}
+
+    def explain(self, sql):
+        """Return (plan lines, findings) for one captured query"""
+        if connection.vendor == 'postgresql':
+            return self.explain_postgresql(sql)
+        return self.explain_sqlite(sql)
+
+    def explain_postgresql(self, sql):
+        options = 'ANALYZE, FORMAT JSON' if self.analyze else 'FORMAT JSON'
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN ({options}) {sql}')
+            document = cursor.fetchone()[0]
+        if isinstance(document, str):
+            document = json.loads(document)
+        lines, findings = [], []
+
+        def walk(node, depth):
+            rows = node.get('Actual Rows', node.get('Plan Rows', 0)) * node.get('Actual Loops', 1)
+            relation = node.get('Relation Name')
+            lines.append('  ' * depth + node['Node Type'] + (f' on {relation}' if relation else '') + f' (rows={rows})')
+            if node['Node Type'] == 'Seq Scan':
+                # A filtered scan still reads the whole table, so size it by the table.
+                scanned = self.count_rows(relation)
+                if scanned >= self.threshold:
+                    findings.append({'kind': 'seq_scan', 'table': relation, 'rows': scanned,
+                                     'filter': node.get('Filter')})
+            elif node['Node Type'] in ('Sort', 'Incremental Sort') and rows >= self.threshold:
+                findings.append({'kind': 'sort', 'table': None, 'rows': rows,
+                                 'sort_key': node.get('Sort Key')})
+            for child in node.get('Plans', []):
+                walk(child, depth + 1)
+
+        walk(document[0]['Plan'], 0)
+        return lines, findings
+
+    def explain_sqlite(self, sql):
+        aliases = {alias or table: table for table, alias in TABLE_ALIAS.findall(sql)}
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            lines = [row[3] for row in cursor.fetchall()]
+        findings = []
+        for detail in lines:
+            scan = SQLITE_SCAN.match(detail)
+            if scan and scan.group(1) in aliases and 'USING' not in scan.group(2):
+                table = aliases[scan.group(1)]
+                rows = self.count_rows(table)
+                if rows >= self.threshold:
+                    findings.append({'kind': 'seq_scan', 'table': table, 'rows': rows, 'detail': detail})
+            elif detail.startswith('USE TEMP B-TREE'):
+                # SQLite gives no row estimates; size the sort by the rows the
+                # statement yields before its LIMIT.
+                rows = self.count_result_rows(sql)
+                if rows >= self.threshold:
+                    findings.append({'kind': 'sort', 'table': None, 'rows': rows, 'detail': detail})
+        return lines, findings
+
+    def count_rows(self, table):
+        """Return (and remember) the number of rows in a table"""
+        if table not in self.table_rows:
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+                self.table_rows[table] = cursor.fetchone()[0]
+        return self.table_rows[table]
+
+    def count_result_rows(self, sql):
+        """Return how many rows a query yields without its trailing LIMIT"""
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM ({TRAILING_LIMIT.sub("", sql)})')
+            return cursor.fetchone()[0]
+
+    def summarize(self, report):
+        self.stdout.write(f'{"endpoint":<20} {"status":>6} {"queries":>7} {"findings":>8}')
+        for endpoint in report['endpoints']:
+            findings = [finding for query in endpoint['queries'] for finding in query['findings']]
+            self.stdout.write(
+                f'{endpoint["name"]:<20} {endpoint["status"]:>6} {len(endpoint["queries"]):>7} {len(findings):>8}'
+            )
+            for finding in findings:
+                self.stdout.write(f'    {finding["kind"]} on {finding["table"] or "-"} ({finding["rows"]} rows)')
+        if report['findings']:
+            self.stdout.write(self.style.WARNING(f"{report['findings']} finding(s) at or above {self.threshold} rows"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'No scans or sorts at or above {self.threshold} rows'))
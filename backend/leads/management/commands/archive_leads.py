@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from leads.archive import archivable_leads, archive_cutoff, archive_leads
+
+
+class Command(BaseCommand):
+    help = 'Move leads soft deleted longer than the retention period, with their activities, to the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.LEAD_ARCHIVE_RETENTION_DAYS,
+                            help='Archive leads soft deleted more than this many days ago '
+                                 '(default: LEAD_ARCHIVE_RETENTION_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=settings.LEAD_ARCHIVE_BATCH_SIZE,
+                            help='Leads moved per transaction (default: LEAD_ARCHIVE_BATCH_SIZE)')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the leads that are due')
+
+    def handle(self, *args, **options):
+        if options['days'] < 0:
+            raise CommandError('--days must not be negative')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        cutoff = archive_cutoff(options['days'])
+        if options['dry_run']:
+            self.stdout.write(f'{archivable_leads(cutoff).count()} lead(s) soft deleted before {cutoff:%Y-%m-%d %H:%M} are due')
+            return
+        leads, activities = archive_leads(cutoff, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {leads} lead(s) with {activities} activities'))
@@ -0,0 +1,157 @@
+import json
+import statistics
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+from leads.cache import bump_data_version
+from leads.models import Activity, Lead
+
+SCENARIOS = ('list', 'search', 'retrieve', 'analytics', 'dashboard', 'activity_create')
+
+
+class Command(BaseCommand):
+    help = 'Drive the lead API in-process and report latency, queries per request and throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', required=True, help='Username whose data the requests read')
+        parser.add_argument('--scenario', choices=SCENARIOS, action='append', dest='scenarios',
+                            help='Scenario to run (repeatable; default: all)')
+        parser.add_argument('--requests', type=int, default=100, help='Measured requests per scenario')
+        parser.add_argument('--warmup', type=int, default=5, help='Unmeasured requests per scenario')
+        parser.add_argument('--cold', action='store_true',
+                            help="Invalidate the user's cached responses before every request")
+        parser.add_argument('--host', default='localhost',
+                            help='Host header for the requests (must be in ALLOWED_HOSTS)')
+        parser.add_argument('--save-baseline', metavar='PATH', help='Write the results to this JSON file')
+        parser.add_argument('--baseline', metavar='PATH', help='Compare the results with this JSON file')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='Allowed p95 slowdown against the baseline, as a fraction (default: 0.2)')
+
+    def handle(self, *args, **options):
+        try:
+            self.user = get_user_model().objects.get(username=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist")
+        if options['requests'] < 2:
+            raise CommandError('--requests must be at least 2')
+        self.lead_ids = list(
+            Lead.objects.filter(created_by=self.user, is_deleted=False).values_list('pk', flat=True)[:100]
+        )
+        if not self.lead_ids:
+            raise CommandError(f"User '{options['user']}' has no leads; run seed_leads first")
+        self.search_term = Lead.objects.get(pk=self.lead_ids[0]).last_name[:3]
+        self.client = Client(HTTP_HOST=options['host'], HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        self.cold = options['cold']
+        self.created_activity_ids = []
+
+        results = {}
+        try:
+            for scenario in options['scenarios'] or SCENARIOS:
+                request = getattr(self, f'request_{scenario}')
+                for n in range(options['warmup']):
+                    request(n)
+                results[scenario] = self.measure(request, options['requests'])
+        finally:
+            Activity.objects.filter(pk__in=self.created_activity_ids).delete()
+
+        self.report(results)
+        if options['save_baseline']:
+            with open(options['save_baseline'], 'w') as baseline:
+                json.dump(results, baseline, indent=2)
+            self.stdout.write(f"Baseline written to {options['save_baseline']}")
+        if options['baseline']:
+            self.compare(results, options['baseline'], options['tolerance'])
+
+    def measure(self, request, count):
+        """Time `count` requests; return latency percentiles, queries and throughput"""
+        timings, queries, errors = [], [], 0
+        started = time.perf_counter()
+        for n in range(count):
+            if self.cold:
+                bump_data_version(self.user.pk)
+            with CaptureQueriesContext(connection) as captured:
+                request_started = time.perf_counter()
+                response = request(n)
+                timings.append(time.perf_counter() - request_started)
+            queries.append(len(captured))
+            errors += response.status_code >= 400
+        elapsed = time.perf_counter() - started
+        cuts = statistics.quantiles(timings, n=100, method='inclusive')
+        return {
+            'requests': count,
+            'errors': errors,
+            'p50_ms': round(cuts[49] * 1000, 2),
+            'p95_ms': round(cuts[94] * 1000, 2),
+            'p99_ms': round(cuts[98] * 1000, 2),
+            'queries': round(statistics.mean(queries), 2),
+            'rps': round(count / elapsed, 1),
+        }
+
+    def report(self, results):
+        self.stdout.write(
+            f'{"scenario":<16} {"reqs":>5} {"errors":>6} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} '
+            f'{"queries":>8} {"req/s":>8}'
+        )
+        for scenario, result in results.items():
+            self.stdout.write(
+                f'{scenario:<16} {result["requests"]:>5} {result["errors"]:>6} {result["p50_ms"]:>8} '
+                f'{result["p95_ms"]:>8} {result["p99_ms"]:>8} {result["queries"]:>8} {result["rps"]:>8}'
+            )
+
+    def compare(self, results, path, tolerance):
+        """Print the change against a saved baseline; fail on slower p95 or more queries"""
+        try:
+            with open(path) as baseline_file:
+                baseline = json.load(baseline_file)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Cannot read baseline {path}: {exc}')
+        regressions = []
+        self.stdout.write(f'\n{"scenario":<16} {"p95 ms":>17} {"change":>8} {"queries":>13}')
+        for scenario, result in results.items():
+            if scenario not in baseline:
+                continue
+            before = baseline[scenario]
+            change = (result['p95_ms'] - before['p95_ms']) / before['p95_ms'] if before['p95_ms'] else 0
+            regressed = change > tolerance or result['queries'] > before['queries']
+            if regressed:
+                regressions.append(scenario)
+            self.stdout.write(
+                f'{scenario:<16} {before["p95_ms"]:>8} -> {result["p95_ms"]:<6} {change:>+8.0%} '
+                f'{before["queries"]:>5} -> {result["queries"]:<5}' + (' REGRESSION' if regressed else '')
+            )
+        if regressions:
+            raise CommandError(f'Regressed against {path}: {", ".join(regressions)}')
+        self.stdout.write(self.style.SUCCESS(f'No regressions against {path}'))
+
+    def lead_id(self, n):
+        return self.lead_ids[n % len(self.lead_ids)]
+
+    def request_list(self, n):
+        return self.client.get('/api/leads/', {'page': n % 5 + 1})
+
+    def request_search(self, n):
+        return self.client.get('/api/leads/', {'search': self.search_term})
+
+    def request_retrieve(self, n):
+        return self.client.get(f'/api/leads/{self.lead_id(n)}/')
+
+    def request_analytics(self, n):
+        return self.client.get('/api/leads/analytics/')
+
+    def request_dashboard(self, n):
+        return self.client.get('/api/dashboard/')
+
+    def request_activity_create(self, n):
+        response = self.client.post('/api/activities/', {
+            'lead': self.lead_id(n),
+            'activity_type': 'note',
+            'title': 'Benchmark note',
+            'activity_date': '2024-01-01T09:00:00Z',
+        }, content_type='application/json')
+        if response.status_code == 201:
+            self.created_activity_ids.append(response.json()['id'])
+        return response
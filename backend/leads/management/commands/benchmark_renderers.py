@@ -0,0 +1,64 @@
+import itertools
+import json
+import time
+import msgpack
+import orjson
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from config.renderers import MessagePackRenderer, ORJSONRenderer
+from leads.models import Activity, Lead
+from leads.rows import RowSerializer
+from leads.serializers import ActivityListSerializer, LeadSerializer
+
+RENDERERS = [
+    ('drf json', JSONRenderer(), json.loads),
+    ('orjson', ORJSONRenderer(), orjson.loads),
+    ('msgpack', MessagePackRenderer(), lambda content: msgpack.unpackb(content, raw=False)),
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare size and encode/decode time of the JSON, orjson and MessagePack renderers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000,
+                            help='Rows per payload; stored rows are repeated if there are fewer')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement; the best is kept')
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        payloads = [
+            ('leads', self.payload(LeadSerializer, Lead.objects.all(), options['rows'])),
+            ('activities', self.payload(ActivityListSerializer, Activity.objects.with_display_names(), options['rows'])),
+        ]
+        self.stdout.write(f'{"payload":<11} {"renderer":<9} {"bytes":>11} {"encode ms":>10} {"decode ms":>10}')
+        for name, data in payloads:
+            expected = json.loads(JSONRenderer().render(data))
+            for renderer_name, renderer, decode in RENDERERS:
+                content = renderer.render(data)
+                if decode(content) != expected:
+                    raise CommandError(f'{renderer_name} output for {name} differs from the JSON renderer')
+                encode_time = self.best(lambda: renderer.render(data))
+                decode_time = self.best(lambda: decode(content))
+                self.stdout.write(
+                    f'{name:<11} {renderer_name:<9} {len(content):>11,} '
+                    f'{encode_time * 1000:>10.1f} {decode_time * 1000:>10.1f}'
+                )
+
+    def payload(self, serializer_class, queryset, count):
+        """Serialize up to `count` stored rows, repeated to `count`, as a paginated page"""
+        queryset = queryset.order_by('pk')[:count]
+        rows = RowSerializer.for_queryset(serializer_class, queryset)
+        results = rows.serialize(rows.values(queryset))
+        if not results:
+            raise CommandError('No rows to render; run seed_leads first')
+        results = list(itertools.islice(itertools.cycle(results), count))
+        return {'count': len(results), 'next': None, 'previous': None, 'results': results}
+
+    def best(self, func):
+        timings = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
@@ -0,0 +1,62 @@
+import itertools
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.utils.encoders import JSONEncoder
+from leads.models import Activity, Lead
+from leads.rows import RowSerializer
+from leads.serializers import ActivityListSerializer, LeadListSerializer, LeadSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compare DRF serializers with the RowSerializer fast path on large payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000,
+                            help='Rows per payload; stored rows are repeated if there are fewer')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement; the best is kept')
+
+    def handle(self, *args, **options):
+        cases = [
+            ('lead list', LeadListSerializer, Lead.objects.all()),
+            ('lead full', LeadSerializer, Lead.objects.all()),
+            ('activity list', ActivityListSerializer, Activity.objects.with_display_names()),
+        ]
+        self.rows = options['rows']
+        self.repeat = options['repeat']
+        self.stdout.write(
+            f'{"payload":<14} {"rows":>6} {"drf rows/s":>11} {"fast rows/s":>12} {"speedup":>8}   '
+            f'{"drf e2e ms":>10} {"fast e2e ms":>11}'
+        )
+        for name, serializer_class, queryset in cases:
+            queryset = queryset.order_by('pk')[:self.rows]
+            row_serializer = RowSerializer.for_queryset(serializer_class, queryset)
+            instances = list(queryset)
+            if not instances:
+                raise CommandError('No rows to serialize; run seed_leads first')
+            values = list(row_serializer.values(queryset))
+            if self.dump(serializer_class(instances, many=True).data) != self.dump(row_serializer.serialize(values)):
+                raise CommandError(f'{name}: fast path output differs from {serializer_class.__name__}')
+
+            instances = list(itertools.islice(itertools.cycle(instances), self.rows))
+            values = list(itertools.islice(itertools.cycle(values), self.rows))
+            drf = self.best(lambda: serializer_class(instances, many=True).data)
+            fast = self.best(lambda: row_serializer.serialize(values))
+            drf_e2e = self.best(lambda: serializer_class(list(queryset), many=True).data)
+            fast_e2e = self.best(lambda: row_serializer.serialize(row_serializer.values(queryset)))
+            self.stdout.write(
+                f'{name:<14} {self.rows:>6} {self.rows / drf:>11,.0f} {self.rows / fast:>12,.0f} {drf / fast:>7.1f}x   '
+                f'{drf_e2e * 1000:>10.1f} {fast_e2e * 1000:>11.1f}'
+            )
+        self.stdout.write('e2e: fetch and serialize the stored rows (up to --rows) from the database')
+
+    def best(self, func):
+        timings = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def dump(self, data):
+        return json.dumps(data, cls=JSONEncoder)
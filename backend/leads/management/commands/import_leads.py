@@ -0,0 +1,42 @@
+import json
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from leads.importer import IMPORT_FORMATS, READERS, ImportFileError, LeadImporter, detect_format
+
+
+class Command(BaseCommand):
+    help = 'Stream leads from a CSV or JSON Lines file into the database in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import')
+        parser.add_argument('--user', required=True, help='Username that will own the imported leads')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, dest='file_format',
+                            help='File format (default: guessed from the extension)')
+        parser.add_argument('--batch-size', type=int, default=settings.LEAD_IMPORT_BATCH_SIZE)
+        parser.add_argument('--report', help='Write rejected rows as CSV to this path')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist")
+        file_format = options['file_format'] or detect_format(options['path'])
+        if file_format is None:
+            raise CommandError('Cannot guess the file format; pass --format')
+
+        report = open(options['report'], 'w', newline='') if options['report'] else None
+        try:
+            with open(options['path'], 'rb') as source:
+                importer = LeadImporter(user, batch_size=options['batch_size'], report=report)
+                result = importer.run(READERS[file_format](source))
+        except ImportFileError as exc:
+            raise CommandError(str(exc))
+        finally:
+            if report:
+                report.close()
+
+        for error in result['errors']:
+            self.stderr.write(f"line {error['line']}: {json.dumps(error['errors'])}")
+        self.stdout.write(self.style.SUCCESS(f"Imported {result['created']} leads, rejected {result['failed']}"))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from leads.models import ActivityDailyRollup
+
+
+class Command(BaseCommand):
+    help = 'Backfill, rebuild or verify the per-agent ActivityDailyRollup against the activities table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', type=int, action='append', dest='user_ids',
+                            help='Limit to this user id (repeatable)')
+        parser.add_argument('--verify', action='store_true',
+                            help='Only compare the rollup with the activities table; exit non-zero on drift')
+
+    def handle(self, *args, **options):
+        user_ids = options['user_ids']
+        if not options['verify']:
+            ActivityDailyRollup.objects.rebuild(user_ids)
+            self.stdout.write(self.style.SUCCESS('ActivityDailyRollup rebuilt'))
+            return
+
+        expected = ActivityDailyRollup.objects.expected_rows(user_ids)
+        stored = ActivityDailyRollup.objects.stored_rows(user_ids)
+        drift = sorted(key for key in expected.keys() | stored.keys() if expected.get(key) != stored.get(key))
+        for user_id, day, activity_type in drift:
+            self.stdout.write(
+                f'user={user_id} day={day} type={activity_type} '
+                f'stored={stored.get((user_id, day, activity_type), (0, 0))} '
+                f'actual={expected.get((user_id, day, activity_type), (0, 0))}'
+            )
+        if drift:
+            raise CommandError(f'{len(drift)} rollup bucket(s) out of date; run without --verify to rebuild')
+        self.stdout.write(self.style.SUCCESS('ActivityDailyRollup matches the activities table'))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from leads.models import LeadStats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild or verify the per-user LeadStats rollup against the leads table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', type=int, action='append', dest='user_ids',
+                            help='Limit to this user id (repeatable)')
+        parser.add_argument('--verify', action='store_true',
+                            help='Only compare the rollup with the leads table; exit non-zero on drift')
+
+    def handle(self, *args, **options):
+        user_ids = options['user_ids']
+        if not options['verify']:
+            LeadStats.objects.rebuild(user_ids)
+            self.stdout.write(self.style.SUCCESS('LeadStats rebuilt'))
+            return
+
+        expected = LeadStats.objects.expected_counts(user_ids)
+        stored = LeadStats.objects.stored_counts(user_ids)
+        drift = sorted(key for key in expected.keys() | stored.keys() if expected.get(key, 0) != stored.get(key, 0))
+        for user_id, status in drift:
+            self.stdout.write(
+                f'user={user_id} status={status} '
+                f'stored={stored.get((user_id, status), 0)} actual={expected.get((user_id, status), 0)}'
+            )
+        if drift:
+            raise CommandError(f'{len(drift)} LeadStats bucket(s) out of date; run without --verify to rebuild')
+        self.stdout.write(self.style.SUCCESS('LeadStats match the leads table'))
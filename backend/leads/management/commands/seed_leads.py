@@ -0,0 +1,151 @@
+import random
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from leads.models import Activity, ActivityDailyRollup, Lead, LeadStats
+from leads.search import sync_search_index
+
+FIRST_NAMES = [
+    'Ava', 'Ben', 'Chloe', 'Daniel', 'Emma', 'Farid', 'Grace', 'Hiro', 'Isla', 'Jonas',
+    'Keira', 'Liam', 'Maya', 'Noah', 'Olivia', 'Priya', 'Quinn', 'Rosa', 'Sam', 'Tariq',
+]
+LAST_NAMES = [
+    'Anders', 'Brown', 'Castillo', 'Dubois', 'Evans', 'Fischer', 'Garcia', 'Haddad', 'Ito', 'Johnson',
+    'Kowalski', 'Lee', 'Murphy', 'Nguyen', 'Okafor', 'Patel', 'Rossi', 'Silva', 'Tanaka', 'Walker',
+]
+PROPERTY_INTERESTS = ['', 'Condo downtown', '3 bed family home', 'Investment duplex', 'Waterfront lot']
+
+DEFAULT_STATUSES = 'new=30,contacted=25,qualified=15,negotiation=10,closed=10,lost=10'
+DEFAULT_SOURCES = 'website=40,referral=25,zillow=25,other=10'
+DEFAULT_ACTIVITY_TYPES = 'call=35,email=35,meeting=10,note=20'
+
+
+def weights(value, choices, option):
+    """Parse 'key=weight,...' into a {key: weight} dict restricted to model choices"""
+    allowed = {key for key, _ in choices}
+    parsed = {}
+    for part in value.split(','):
+        key, _, weight = part.partition('=')
+        if key.strip() not in allowed:
+            raise CommandError(f'{option}: unknown value {key.strip()!r}; expected one of {", ".join(sorted(allowed))}')
+        try:
+            parsed[key.strip()] = float(weight)
+        except ValueError:
+            raise CommandError(f'{option}: weight for {key.strip()!r} is not a number')
+    if not any(parsed.values()):
+        raise CommandError(f'{option}: at least one weight must be positive')
+    return parsed
+
+
+class Command(BaseCommand):
+    help = 'Generate users with realistic leads and activities for load testing, using bulk inserts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--leads-per-user', type=int, default=200)
+        parser.add_argument('--activities-per-lead', type=float, default=3,
+                            help='Average activities per lead (uniform between 0 and twice this)')
+        parser.add_argument('--statuses', default=DEFAULT_STATUSES, help='Lead status weights')
+        parser.add_argument('--sources', default=DEFAULT_SOURCES, help='Lead source weights')
+        parser.add_argument('--activity-types', default=DEFAULT_ACTIVITY_TYPES, help='Activity type weights')
+        parser.add_argument('--budget-min', type=int, default=100000, help='Lowest minimum budget')
+        parser.add_argument('--budget-max', type=int, default=2000000, help='Highest minimum budget')
+        parser.add_argument('--days', type=int, default=365, help='Spread activity dates over this many past days')
+        parser.add_argument('--prefix', default='seed', help='Prefix for generated usernames and emails')
+        parser.add_argument('--password', default='seed12345', help='Password for every generated user')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int, help='Random seed, for reproducible data')
+        parser.add_argument('--clear', action='store_true',
+                            help='Delete users (and their data) left by a previous run with this prefix')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        self.rng = random.Random(options['seed'])
+        self.options = options
+        self.statuses = weights(options['statuses'], Lead.STATUS_CHOICES, '--statuses')
+        self.sources = weights(options['sources'], Lead.SOURCE_CHOICES, '--sources')
+        self.activity_types = weights(options['activity_types'], Activity.ACTIVITY_TYPE_CHOICES, '--activity-types')
+        if options['budget_min'] > options['budget_max']:
+            raise CommandError('--budget-min must not exceed --budget-max')
+
+        prefix = options['prefix']
+        existing = User.objects.filter(username__startswith=f'{prefix}-user-')
+        if options['clear']:
+            deleted = existing.count()
+            existing.delete()
+            self.stdout.write(f'Removed {deleted} previously seeded users')
+        elif existing.exists():
+            raise CommandError(f"Users named '{prefix}-user-*' already exist; pass --clear or another --prefix")
+
+        password = make_password(options['password'])
+        users = User.objects.bulk_create([
+            User(username=f'{prefix}-user-{n}', email=f'{prefix}-user-{n}@example.com', password=password,
+                 first_name=self.rng.choice(FIRST_NAMES), last_name=self.rng.choice(LAST_NAMES))
+            for n in range(options['users'])
+        ], batch_size=options['batch_size'])
+
+        leads_created = activities_created = 0
+        for user in users:
+            for start in range(0, options['leads_per_user'], options['batch_size']):
+                count = min(options['batch_size'], options['leads_per_user'] - start)
+                with transaction.atomic():
+                    leads = Lead.objects.bulk_create([self.make_lead(user, start + n) for n in range(count)])
+                    LeadStats.objects.apply_deltas(Counter(lead.stats_key() for lead in leads))
+                    sync_search_index(leads)
+                    activities = Activity.objects.bulk_create(
+                        [activity for lead in leads for activity in self.make_activities(lead)],
+                        batch_size=options['batch_size'],
+                    )
+                    ActivityDailyRollup.objects.add_lead_activities([lead.pk for lead in leads])
+                leads_created += len(leads)
+                activities_created += len(activities)
+            self.stdout.write(f'{user.username}: {options["leads_per_user"]} leads')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {len(users)} users, {leads_created} leads and {activities_created} activities '
+            f"(password '{options['password']}')"
+        ))
+
+    def pick(self, choice_weights):
+        return self.rng.choices(list(choice_weights), weights=list(choice_weights.values()))[0]
+
+    def make_lead(self, user, n):
+        """Build one unsaved lead for `user`"""
+        first_name, last_name = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+        budget_min = self.rng.randint(self.options['budget_min'], self.options['budget_max']) // 1000 * 1000
+        budget_max = int(budget_min * self.rng.uniform(1.1, 1.6)) // 1000 * 1000
+        return Lead(
+            first_name=first_name,
+            last_name=last_name,
+            email=f'{first_name}.{last_name}.{user.pk}.{n}@{self.options["prefix"]}.example.com'.lower(),
+            phone=f'555-{self.rng.randint(1000000, 9999999)}',
+            budget_min=Decimal(budget_min),
+            budget_max=Decimal(budget_max),
+            status=self.pick(self.statuses),
+            source=self.pick(self.sources),
+            property_interest=self.rng.choice(PROPERTY_INTERESTS),
+            created_by=user,
+        )
+
+    def make_activities(self, lead):
+        """Build a random number of unsaved activities for a saved lead"""
+        now = timezone.now()
+        count = self.rng.randint(0, round(self.options['activities_per_lead'] * 2))
+        activities = []
+        for _ in range(count):
+            activity_type = self.pick(self.activity_types)
+            activities.append(Activity(
+                lead=lead,
+                activity_type=activity_type,
+                title=f'{activity_type.title()} with {lead.first_name}',
+                notes='',
+                date=now - timedelta(minutes=self.rng.randint(0, self.options['days'] * 24 * 60)),
+                duration_minutes=self.rng.randint(5, 90) if activity_type in ('call', 'meeting') else None,
+                created_by=lead.created_by,
+            ))
+        return activities
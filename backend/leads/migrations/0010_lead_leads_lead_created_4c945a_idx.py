@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0009_lead_created_by'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['created_by', 'is_deleted', 'created_at'], name='leads_lead_created_4c945a_idx'),
+        ),
+    ]
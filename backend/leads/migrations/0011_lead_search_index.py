@@ -0,0 +1,47 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+SEARCH_INDEX_NAME = 'leads_lead_search_idx'
+FTS_TABLE = 'leads_lead_fts'
+
+
+def search_index():
+    return GinIndex(
+        SearchVector('first_name', 'last_name', 'email', config='simple'),
+        name=SEARCH_INDEX_NAME,
+    )
+
+
+def create_search_index(apps, schema_editor):
+    """GIN expression index on Postgres, FTS5 shadow table on SQLite"""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.add_index(apps.get_model('leads', 'Lead'), search_index())
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(first_name, last_name, email)'
+        )
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, first_name, last_name, email) '
+            'SELECT id, first_name, last_name, email FROM leads_lead WHERE NOT is_deleted'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.remove_index(apps.get_model('leads', 'Lead'), search_index())
+    elif vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0010_lead_leads_lead_created_4c945a_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
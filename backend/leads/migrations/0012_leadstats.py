@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:36
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_lead_stats(apps, schema_editor):
+    Lead = apps.get_model('leads', 'Lead')
+    LeadStats = apps.get_model('leads', 'LeadStats')
+    db_alias = schema_editor.connection.alias
+    rows = (
+        Lead.objects.using(db_alias)
+        .filter(is_deleted=False, created_by__isnull=False)
+        .order_by()
+        .values('created_by_id', 'status')
+        .annotate(count=models.Count('id'))
+    )
+    LeadStats.objects.using(db_alias).bulk_create(
+        LeadStats(user_id=row['created_by_id'], status=row['status'], count=row['count'])
+        for row in rows
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('leads', '0011_lead_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeadStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('new', 'New'), ('contacted', 'Contacted'), ('qualified', 'Qualified'), ('negotiation', 'Negotiation'), ('closed', 'Closed'), ('lost', 'Lost')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lead_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='leadstats',
+            constraint=models.UniqueConstraint(fields=('user', 'status'), name='unique_lead_stats_user_status'),
+        ),
+        migrations.RunPython(populate_lead_stats, migrations.RunPython.noop),
+    ]
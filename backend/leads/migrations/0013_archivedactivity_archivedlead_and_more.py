@@ -0,0 +1,92 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:04
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('leads', '0012_leadstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedActivity',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('activity_type', models.CharField(choices=[('call', 'Call'), ('email', 'Email'), ('meeting', 'Meeting'), ('note', 'Note')])),
+                ('title', models.CharField()),
+                ('notes', models.TextField(blank=True)),
+                ('date', models.DateTimeField()),
+                ('duration_minutes', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['-date', '-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedLead',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('first_name', models.CharField()),
+                ('last_name', models.CharField()),
+                ('email', models.EmailField(max_length=254)),
+                ('phone', models.CharField()),
+                ('budget_min', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('budget_max', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('status', models.CharField(choices=[('new', 'New'), ('contacted', 'Contacted'), ('qualified', 'Qualified'), ('negotiation', 'Negotiation'), ('closed', 'Closed'), ('lost', 'Lost')], max_length=20)),
+                ('source', models.CharField(choices=[('website', 'Website'), ('referral', 'Referral'), ('zillow', 'Zillow'), ('other', 'Other')], max_length=50)),
+                ('property_interest', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('is_active', models.BooleanField(default=False)),
+                ('is_deleted', models.BooleanField(default=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-deleted_at', '-id'],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='lead',
+            name='leads_lead_is_dele_45657d_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='lead',
+            name='leads_lead_created_4c945a_idx',
+        ),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['created_by', '-created_at'], name='lead_live_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(condition=models.Q(('is_deleted', True)), fields=['deleted_at'], name='lead_deleted_at_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedlead',
+            name='created_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archived_leads', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedactivity',
+            name='created_by',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_activities', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedactivity',
+            name='lead',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activities', to='leads.archivedlead'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedlead',
+            index=models.Index(fields=['created_by', '-deleted_at'], name='leads_archi_created_4377a7_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models.functions import Coalesce, TruncDate
+
+
+def populate_activity_rollups(apps, schema_editor):
+    Activity = apps.get_model('leads', 'Activity')
+    ActivityDailyRollup = apps.get_model('leads', 'ActivityDailyRollup')
+    db_alias = schema_editor.connection.alias
+    rows = (
+        Activity.objects.using(db_alias)
+        .filter(lead__is_deleted=False)
+        .order_by()
+        .annotate(day=TruncDate('date'))
+        .values('created_by_id', 'day', 'activity_type')
+        .annotate(count=models.Count('id'), minutes=Coalesce(models.Sum('duration_minutes'), 0))
+    )
+    ActivityDailyRollup.objects.using(db_alias).bulk_create(
+        (
+            ActivityDailyRollup(
+                user_id=row['created_by_id'], day=row['day'], activity_type=row['activity_type'],
+                count=row['count'], duration_minutes=row['minutes'],
+            )
+            for row in rows
+        ),
+        batch_size=1000,
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('leads', '0013_archivedactivity_archivedlead_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('activity_type', models.CharField(choices=[('call', 'Call'), ('email', 'Email'), ('meeting', 'Meeting'), ('note', 'Note')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('duration_minutes', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='leads_activ_day_c39256_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='activitydailyrollup',
+            constraint=models.UniqueConstraint(fields=('user', 'day', 'activity_type'), name='unique_activity_rollup_user_day_type'),
+        ),
+        migrations.RunPython(populate_activity_rollups, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+from collections import Counter
+from django.db import connections, models, router, transaction
+from django.db.models.functions import Coalesce, Concat, TruncDate, TruncMonth, TruncWeek, Trim
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
@@ -45,7 +47,17 @@ class Lead(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['status']),
-            models.Index(fields=['is_deleted']),
+            # Partial indexes: live rows for every read path, deleted rows for archiving.
+            models.Index(
+                fields=['created_by', '-created_at'],
+                condition=models.Q(is_deleted=False),
+                name='lead_live_owner_created_idx',
+            ),
+            models.Index(
+                fields=['deleted_at'],
+                condition=models.Q(is_deleted=True),
+                name='lead_deleted_at_idx',
+            ),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -68,12 +80,142 @@ class Lead(models.Model):
             return f"${self.budget_min:,.0f} - ${self.budget_max:,.0f}"
         return "Not specified"
     
+    def stats_key(self):
+        """Return the (user id, status) LeadStats bucket for this lead, or None"""
+        if self.is_deleted or self.created_by_id is None:
+            return None
+        return (self.created_by_id, self.status)
+    
+    def _get_stored_stats_key(self, using):
+        """Read the stored row's bucket under a row lock, so concurrent writers cannot both move it"""
+        if self._state.adding:
+            return None
+        stored = (
+            Lead.objects.using(using).select_for_update().filter(pk=self.pk)
+            .values('status', 'is_deleted', 'created_by_id').first()
+        )
+        if stored is None or stored['is_deleted'] or stored['created_by_id'] is None:
+            return None
+        return (stored['created_by_id'], stored['status'])
+    
+    def save(self, *args, **kwargs):
+        """Save the lead and move it between LeadStats buckets in the same transaction"""
+        using = kwargs.get('using') or router.db_for_write(Lead, instance=self)
+        with transaction.atomic(using=using):
+            previous = self._get_stored_stats_key(using)
+            super().save(*args, **kwargs)
+            current = self.stats_key()
+            if previous != current:
+                deltas = Counter()
+                if previous:
+                    deltas[previous] -= 1
+                if current:
+                    deltas[current] += 1
+                LeadStats.objects.using(using).apply_deltas(deltas)
+    
+    def delete(self, *args, **kwargs):
+        """Hard delete the lead and drop it from LeadStats"""
+        using = kwargs.get('using') or router.db_for_write(Lead, instance=self)
+        with transaction.atomic(using=using):
+            previous = self._get_stored_stats_key(using)
+            result = super().delete(*args, **kwargs)
+            if previous:
+                LeadStats.objects.using(using).apply_deltas({previous: -1})
+        return result
+    
     def soft_delete(self):
-        """Soft delete the lead"""
-        self.is_deleted = True
-        self.is_active = False
-        self.deleted_at = timezone.now()
-        self.save()
+        """Soft delete the lead and drop its activities from the rollup"""
+        using = router.db_for_write(Lead, instance=self)
+        with transaction.atomic(using=using):
+            # Lock the row first: a concurrent soft delete waits here and then
+            # finds the lead already deleted instead of subtracting it twice.
+            stored = Lead.objects.using(using).select_for_update().filter(pk=self.pk).values_list('is_deleted', flat=True)
+            if stored.first() is not False:
+                return
+            ActivityDailyRollup.objects.using(using).add_lead_activities([self.pk], sign=-1)
+            self.is_deleted = True
+            self.is_active = False
+            self.deleted_at = timezone.now()
+            self.save()
+
+class LeadStatsQuerySet(models.QuerySet):
+    """QuerySet helpers for maintaining and reading LeadStats"""
+    
+    def apply_deltas(self, deltas):
+        """Add each {(user id, status): delta} to its bucket, creating buckets as needed"""
+        for (user_id, status), delta in deltas.items():
+            if not delta:
+                continue
+            bucket = self.filter(user_id=user_id, status=status)
+            if bucket.update(count=models.F('count') + delta):
+                continue
+            _, created = self.get_or_create(user_id=user_id, status=status, defaults={'count': delta})
+            if not created:
+                bucket.update(count=models.F('count') + delta)
+    
+    def counts_for(self, user):
+        """Return {status: count} for the user's live leads, omitting empty statuses"""
+        return dict(self.filter(user=user, count__gt=0).values_list('status', 'count'))
+    
+    def expected_counts(self, user_ids=None):
+        """Recount live leads from the source table as {(user id, status): count}"""
+        leads = Lead.objects.using(self.db).filter(is_deleted=False, created_by__isnull=False)
+        if user_ids is not None:
+            leads = leads.filter(created_by_id__in=user_ids)
+        rows = leads.order_by().values('created_by_id', 'status').annotate(count=models.Count('id'))
+        return {(row['created_by_id'], row['status']): row['count'] for row in rows}
+    
+    def stored_counts(self, user_ids=None):
+        """Return the rollup as {(user id, status): count}, omitting empty buckets"""
+        stats = self.filter(count__gt=0) if user_ids is None else self.filter(count__gt=0, user_id__in=user_ids)
+        return {(row.user_id, row.status): row.count for row in stats}
+    
+    def rebuild(self, user_ids=None):
+        """Replace the rollup with a fresh recount of the source table"""
+        with transaction.atomic(using=self.db):
+            stale = self.all() if user_ids is None else self.filter(user_id__in=user_ids)
+            stale.delete()
+            self.bulk_create(
+                LeadStats(user_id=user_id, status=status, count=count)
+                for (user_id, status), count in self.expected_counts(user_ids).items()
+            )
+
+class LeadStats(models.Model):
+    """Per-user count of live leads in each status"""
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='lead_stats')
+    status = models.CharField(max_length=20, choices=Lead.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+    
+    objects = LeadStatsQuerySet.as_manager()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'status'], name='unique_lead_stats_user_status'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} {self.status}: {self.count}"
+
+class ActivityQuerySet(models.QuerySet):
+    """QuerySet helpers for Activity"""
+    
+    PLACEHOLDER_USER_NAMES = ['', 'User Name', 'First Last']
+    
+    def with_display_names(self):
+        """Annotate lead_name and created_by_name in SQL instead of per row in Python"""
+        return self.alias(
+            created_by_full_name=Trim(Concat('created_by__first_name', models.Value(' '), 'created_by__last_name')),
+        ).annotate(
+            lead_name=Concat('lead__first_name', models.Value(' '), 'lead__last_name'),
+            created_by_name=models.Case(
+                models.When(
+                    created_by_full_name__in=self.PLACEHOLDER_USER_NAMES,
+                    then='created_by__username',
+                ),
+                default='created_by_full_name',
+            ),
+        )
 
 class Activity(models.Model):
     """Activity model for tracking lead interactions"""
@@ -95,6 +237,8 @@ class Activity(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ActivityQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-date', '-created_at']
         indexes = [
@@ -104,9 +248,257 @@ class Activity(models.Model):
     def __str__(self):
         return f"{self.get_activity_type_display()} - {self.title}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember which ActivityDailyRollup bucket the stored row counts towards"""
+        instance = super().from_db(db, field_names, values)
+        if {'created_by_id', 'date', 'activity_type', 'duration_minutes'}.issubset(instance.__dict__):
+            instance._stored_rollup_entry = instance.rollup_entry()
+        return instance
+    
+    def rollup_entry(self):
+        """Return the ((user id, day, activity type), minutes) this activity adds to the rollup"""
+        return (
+            (self.created_by_id, timezone.localdate(self.date), self.activity_type),
+            self.duration_minutes or 0,
+        )
+    
+    def _get_stored_rollup_entry(self, using):
+        if self._state.adding:
+            return None
+        if hasattr(self, '_stored_rollup_entry'):
+            return self._stored_rollup_entry
+        stored = Activity.objects.using(using).filter(pk=self.pk).first()
+        return stored.rollup_entry() if stored is not None else None
+    
+    def _counts_in_rollup(self):
+        """Activities of soft-deleted leads are left out of the rollup"""
+        return not self.lead.is_deleted
+    
+    def save(self, *args, **kwargs):
+        """Save the activity and move it between rollup buckets in the same transaction"""
+        using = kwargs.get('using') or router.db_for_write(Activity, instance=self)
+        with transaction.atomic(using=using):
+            previous = self._get_stored_rollup_entry(using)
+            super().save(*args, **kwargs)
+            current = self.rollup_entry()
+            if previous != current and self._counts_in_rollup():
+                deltas = {}
+                if previous:
+                    add_rollup_entry(deltas, previous, -1)
+                add_rollup_entry(deltas, current, 1)
+                ActivityDailyRollup.objects.using(using).apply_deltas(deltas)
+            self._stored_rollup_entry = current
+    
     def clean(self):
         """Validate that duration is provided for calls"""
         from django.core.exceptions import ValidationError
         
         if self.activity_type == 'call' and not self.duration_minutes:
             raise ValidationError("Duration is required for call activities")
+
+
+def add_rollup_entry(deltas, entry, sign):
+    """Add an activity's rollup entry to {(user id, day, activity type): (count, minutes)} deltas"""
+    key, minutes = entry
+    count, total = deltas.get(key, (0, 0))
+    deltas[key] = (count + sign, total + sign * minutes)
+
+class ActivityDailyRollupQuerySet(models.QuerySet):
+    """QuerySet helpers for maintaining and reading ActivityDailyRollup"""
+    
+    PERIODS = {'day': None, 'week': TruncWeek, 'month': TruncMonth}
+    
+    UPSERT_CHUNK_SIZE = 100
+    
+    def apply_deltas(self, deltas):
+        """Add each {(user id, day, activity type): (count, minutes)} delta to its bucket, creating buckets as needed"""
+        deltas = {key: delta for key, delta in deltas.items() if any(delta)}
+        connection = connections[self.db]
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            return self._apply_deltas_per_bucket(deltas)
+        # Both backends support ON CONFLICT, so a whole chunk of buckets is one
+        # statement that never races with a concurrent insert of the same bucket.
+        quote = connection.ops.quote_name
+        table = quote(ActivityDailyRollup._meta.db_table)
+        count, minutes = quote('count'), quote('duration_minutes')
+        rows = [
+            (user_id, connection.ops.adapt_datefield_value(day), activity_type, count_delta, minutes_delta)
+            for (user_id, day, activity_type), (count_delta, minutes_delta) in deltas.items()
+        ]
+        for start in range(0, len(rows), self.UPSERT_CHUNK_SIZE):
+            chunk = rows[start:start + self.UPSERT_CHUNK_SIZE]
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'INSERT INTO {table} ({quote("user_id")}, {quote("day")}, {quote("activity_type")}, {count}, {minutes}) '
+                    f'VALUES {", ".join(["(%s, %s, %s, %s, %s)"] * len(chunk))} '
+                    f'ON CONFLICT ({quote("user_id")}, {quote("day")}, {quote("activity_type")}) DO UPDATE SET '
+                    f'{count} = {table}.{count} + excluded.{count}, '
+                    f'{minutes} = {table}.{minutes} + excluded.{minutes}',
+                    [value for row in chunk for value in row],
+                )
+    
+    def _apply_deltas_per_bucket(self, deltas):
+        for (user_id, day, activity_type), (count, minutes) in deltas.items():
+            bucket = self.filter(user_id=user_id, day=day, activity_type=activity_type)
+            changes = {'count': models.F('count') + count, 'duration_minutes': models.F('duration_minutes') + minutes}
+            if bucket.update(**changes):
+                continue
+            _, created = self.get_or_create(
+                user_id=user_id, day=day, activity_type=activity_type,
+                defaults={'count': count, 'duration_minutes': minutes},
+            )
+            if not created:
+                bucket.update(**changes)
+    
+    def add_activities(self, activities, sign=1):
+        """Add (or with sign=-1 remove) activities of live leads from the rollup"""
+        deltas = {}
+        for activity in activities:
+            add_rollup_entry(deltas, activity.rollup_entry(), sign)
+        self.apply_deltas(deltas)
+    
+    def add_lead_activities(self, lead_ids, sign=1):
+        """Add (or with sign=-1 remove) every activity of the given live leads, aggregated in SQL"""
+        activities = Activity.objects.using(self.db).filter(lead_id__in=lead_ids, lead__is_deleted=False)
+        self.apply_deltas({
+            key: (sign * count, sign * minutes)
+            for key, (count, minutes) in self._aggregate(activities).items()
+        })
+    
+    def expected_rows(self, user_ids=None):
+        """Recount activities of live leads as {(user id, day, activity type): (count, minutes)}"""
+        activities = Activity.objects.using(self.db).filter(lead__is_deleted=False)
+        if user_ids is not None:
+            activities = activities.filter(created_by_id__in=user_ids)
+        return self._aggregate(activities)
+    
+    def _aggregate(self, activities):
+        rows = (
+            activities.order_by()
+            .annotate(day=TruncDate('date'))
+            .values('created_by_id', 'day', 'activity_type')
+            .annotate(count=models.Count('id'), minutes=Coalesce(models.Sum('duration_minutes'), 0))
+        )
+        return {
+            (row['created_by_id'], row['day'], row['activity_type']): (row['count'], row['minutes'])
+            for row in rows
+        }
+    
+    def stored_rows(self, user_ids=None):
+        """Return the rollup as {(user id, day, activity type): (count, minutes)}, omitting empty buckets"""
+        rollups = self.filter(count__gt=0) if user_ids is None else self.filter(count__gt=0, user_id__in=user_ids)
+        return {
+            (row.user_id, row.day, row.activity_type): (row.count, row.duration_minutes)
+            for row in rollups
+        }
+    
+    def rebuild(self, user_ids=None):
+        """Replace the rollup with a fresh recount of the activity table"""
+        with transaction.atomic(using=self.db):
+            stale = self.all() if user_ids is None else self.filter(user_id__in=user_ids)
+            stale.delete()
+            self.bulk_create(
+                (
+                    ActivityDailyRollup(
+                        user_id=user_id, day=day, activity_type=activity_type,
+                        count=count, duration_minutes=minutes,
+                    )
+                    for (user_id, day, activity_type), (count, minutes) in self.expected_rows(user_ids).items()
+                ),
+                batch_size=1000,
+            )
+    
+    def series(self, period):
+        """Sum counts and minutes per period start, user and activity type"""
+        truncate = self.PERIODS[period]
+        period_start = models.F('day') if truncate is None else truncate('day')
+        return (
+            self.filter(count__gt=0)
+            .order_by()
+            .annotate(period=period_start)
+            .values('period', 'user_id', 'activity_type')
+            .annotate(count=models.Sum('count'), duration_minutes=models.Sum('duration_minutes'))
+            .order_by('period', 'user_id', 'activity_type')
+        )
+
+class ActivityDailyRollup(models.Model):
+    """Per-agent daily count and total duration of activities of each type"""
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='activity_rollups')
+    day = models.DateField()
+    activity_type = models.CharField(max_length=20, choices=Activity.ACTIVITY_TYPE_CHOICES)
+    count = models.IntegerField(default=0)
+    duration_minutes = models.IntegerField(default=0)
+    
+    objects = ActivityDailyRollupQuerySet.as_manager()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'day', 'activity_type'], name='unique_activity_rollup_user_day_type'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} {self.day} {self.activity_type}: {self.count}"
+
+class ArchivedLead(models.Model):
+    """Lead moved out of the live table after its soft-delete retention period"""
+    
+    id = models.BigIntegerField(primary_key=True)
+    first_name = models.CharField()
+    last_name = models.CharField()
+    email = models.EmailField()
+    phone = models.CharField()
+    
+    budget_min = models.DecimalField(max_digits=12, decimal_places=2)
+    budget_max = models.DecimalField(max_digits=12, decimal_places=2)
+    
+    status = models.CharField(max_length=20, choices=Lead.STATUS_CHOICES)
+    source = models.CharField(max_length=50, choices=Lead.SOURCE_CHOICES)
+    property_interest = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    is_active = models.BooleanField(default=False)
+    is_deleted = models.BooleanField(default=True)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='archived_leads')
+    archived_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['-deleted_at', '-id']
+        indexes = [
+            models.Index(fields=['created_by', '-deleted_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.first_name} {self.last_name}"
+    
+    @property
+    def full_name(self):
+        return f"{self.first_name} {self.last_name}"
+
+class ArchivedActivity(models.Model):
+    """Activity archived together with its lead"""
+    
+    id = models.BigIntegerField(primary_key=True)
+    lead = models.ForeignKey(ArchivedLead, on_delete=models.CASCADE, related_name='activities')
+    activity_type = models.CharField(choices=Activity.ACTIVITY_TYPE_CHOICES)
+    title = models.CharField()
+    notes = models.TextField(blank=True)
+    date = models.DateTimeField()
+    duration_minutes = models.PositiveIntegerField(null=True, blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_activities')
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    
+    class Meta:
+        ordering = ['-date', '-created_at']
+    
+    def __str__(self):
+        return f"{self.get_activity_type_display()} - {self.title}"
@@ -0,0 +1,27 @@
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+class LeadCursorPagination(CursorPagination):
+    """Keyset pagination for leads, newest first, without a total count"""
+    ordering = ('-created_at', 'id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class ActivityCursorPagination(CursorPagination):
+    """Keyset pagination for a lead's activity timeline, served by the (lead, -date) index"""
+    ordering = ('-date', '-created_at')
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    
+    def get_link_after(self, url, activities):
+        """Return the link to the page that follows activities already shown, first page first"""
+        self.base_url = url
+        # Mark the position of the last activity outside the trailing run of
+        # equal dates and skip that run by offset, as get_next_link does.
+        positions = [self._get_position_from_instance(activity, self.ordering) for activity in activities]
+        offset = 0
+        while offset < len(positions) and positions[-1 - offset] == positions[-1]:
+            offset += 1
+        position = positions[-1 - offset] if offset < len(positions) else None
+        return self.encode_cursor(Cursor(offset=offset, reverse=False, position=position))
@@ -0,0 +1,173 @@
+from datetime import datetime
+from functools import lru_cache
+from types import SimpleNamespace
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.utils import timezone
+from django.utils.encoding import force_str
+from rest_framework import ISO_8601, serializers
+from rest_framework.fields import ReadOnlyField
+from rest_framework.relations import PKOnlyObject, PrimaryKeyRelatedField
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+class RowSerializer:
+    """Read-only fast path that renders values() rows exactly like a ModelSerializer
+
+    The serializer's bound fields are compiled once into per-field mappers
+    that read columns straight from the row dict and reuse each DRF field's
+    own to_representation, so the output matches serializer.data without
+    building model instances or walking the field machinery per row.
+    Supported sources: model columns, foreign keys (as primary keys),
+    queryset annotations, get_FOO_display and model properties listed in
+    Meta.field_columns. Anything else raises ImproperlyConfigured.
+    """
+    
+    def __init__(self, serializer_class, fields=None, annotations=()):
+        # Fields render in declaration order whatever order they were asked
+        # for, so any ordering of the same set shares one compiled entry.
+        self.columns, self.mappers = self._compile(
+            serializer_class,
+            frozenset(fields) if fields is not None else None,
+            frozenset(annotations),
+        )
+    
+    @classmethod
+    def for_queryset(cls, serializer_class, queryset, fields=None):
+        """Compile against a queryset, so its annotations can be read as columns"""
+        return cls(serializer_class, fields, queryset.query.annotation_select)
+    
+    def values(self, queryset, *extra_columns):
+        """Return the queryset as values() rows carrying every needed column"""
+        return queryset.values(*self.columns, *(c for c in extra_columns if c not in self.columns))
+    
+    def serialize(self, rows):
+        """Render an iterable of row dicts as a list of representations"""
+        mappers = self.mappers
+        # DateTimeField's default timezone, resolved once instead of per value.
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        return [{name: mapper(row, tz) for name, mapper in mappers} for row in rows]
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _compile(serializer_class, fields, annotations):
+        """Compile (columns, mappers), memoised per serializer, field set and annotations"""
+        kwargs = {'fields': fields} if fields is not None else {}
+        serializer = serializer_class(**kwargs)
+        model = serializer_class.Meta.model
+        field_columns = getattr(serializer_class.Meta, 'field_columns', {})
+        columns, mappers = [], []
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+            source = field.source
+            mapper, needed = _compile_field(field, source, model, field_columns, annotations)
+            if mapper is None:
+                raise ImproperlyConfigured(
+                    f'{serializer_class.__name__}.{field.field_name} (source {source!r}) '
+                    f'is not supported by RowSerializer'
+                )
+            mappers.append((field.field_name, mapper))
+            columns.extend(column for column in needed if column not in columns)
+        return tuple(columns), tuple(mappers)
+
+
+def _column(column, convert):
+    def mapper(row, tz):
+        value = row[column]
+        return None if value is None else convert(value)
+    return mapper
+
+
+def _datetime_column(column, field):
+    """Map an aware datetime like DateTimeField.to_representation, minus its per-value lookups"""
+    convert = field.to_representation
+    
+    def mapper(row, tz):
+        value = row[column]
+        if value is None:
+            return None
+        if tz is None or not isinstance(value, datetime) or value.tzinfo is None:
+            return convert(value)
+        try:
+            value = value.astimezone(tz).isoformat()
+        except OverflowError:
+            return convert(value)
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return mapper
+
+
+def _compile_field(field, source, model, field_columns, annotations):
+    """Return (mapper, columns) for one bound field, or (None, ()) if unsupported"""
+    if source in annotations:
+        return _column(source, field.to_representation), (source,)
+    
+    if source.startswith('get_') and source.endswith('_display'):
+        try:
+            model_field = model._meta.get_field(source[4:-8])
+        except FieldDoesNotExist:
+            return None, ()
+        choices = dict(model_field.flatchoices)
+        convert = field.to_representation
+        
+        def display(value):
+            return convert(force_str(choices.get(value, value), strings_only=True))
+        return _column(model_field.attname, display), (model_field.attname,)
+    
+    if source in field_columns:
+        prop = getattr(model, source, None)
+        if not isinstance(prop, property):
+            return None, ()
+        needed = tuple(field_columns[source])
+        convert = None if isinstance(field, ReadOnlyField) else field.to_representation
+        
+        def computed(row, tz):
+            value = prop.fget(SimpleNamespace(**{column: row[column] for column in needed}))
+            if value is None or convert is None:
+                return value
+            return convert(value)
+        return computed, needed
+    
+    try:
+        model_field = model._meta.get_field(source)
+    except FieldDoesNotExist:
+        return None, ()
+    if not model_field.concrete:
+        return None, ()
+    if model_field.is_relation:
+        if not isinstance(field, PrimaryKeyRelatedField):
+            return None, ()
+        if field.pk_field is None:
+            return _column(model_field.attname, lambda value: value), (model_field.attname,)
+        return _column(model_field.attname, lambda value: field.to_representation(PKOnlyObject(value))), (model_field.attname,)
+    if (isinstance(field, serializers.DateTimeField) and not hasattr(field, 'timezone')
+            and str(getattr(field, 'format', api_settings.DATETIME_FORMAT)).lower() == ISO_8601):
+        return _datetime_column(model_field.attname, field), (model_field.attname,)
+    return _column(model_field.attname, field.to_representation), (model_field.attname,)
+
+
+class RowListMixin:
+    """Serve the list action through a RowSerializer built from the list serializer"""
+    
+    def get_list_fields(self):
+        """Return the fields to render, or None for all of them"""
+        return None
+    
+    def get_row_serializer(self, queryset):
+        return RowSerializer.for_queryset(self.get_serializer_class(), queryset, self.get_list_fields())
+    
+    def get_pagination_columns(self):
+        """Return the columns keyset pagination reads from each row"""
+        ordering = getattr(self.paginator, 'ordering', None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return [field.lstrip('-') for field in ordering]
+    
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = self.get_row_serializer(queryset)
+        page = self.paginate_queryset(rows.values(queryset, *self.get_pagination_columns()))
+        if page is not None:
+            return self.get_paginated_response(rows.serialize(page))
+        return Response(rows.serialize(rows.values(queryset)))
@@ -0,0 +1,93 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+from .models import Lead
+
+SEARCH_FIELDS = ('first_name', 'last_name', 'email')
+SEARCH_CONFIG = 'simple'
+FTS_TABLE = 'leads_lead_fts'
+
+
+def search_leads(queryset, terms):
+    """Return leads matching every term as a prefix, best matches first"""
+    if not terms:
+        return queryset
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        return _postgres_search(queryset, terms)
+    if vendor == 'sqlite':
+        return _sqlite_search(queryset, terms)
+    for term in terms:
+        queryset = queryset.filter(
+            Q(first_name__icontains=term) | Q(last_name__icontains=term) | Q(email__icontains=term)
+        )
+    return queryset
+
+
+def _postgres_search(queryset, terms):
+    """Match against the GIN-indexed tsvector expression and rank by ts_rank"""
+    vector = SearchVector(*SEARCH_FIELDS, config=SEARCH_CONFIG)
+    raw_query = ' & '.join("'%s':*" % term.replace('\\', '\\\\').replace("'", "''") for term in terms)
+    query = SearchQuery(raw_query, search_type='raw', config=SEARCH_CONFIG)
+    return (
+        queryset.alias(search=vector, search_rank=SearchRank(vector, query))
+        .filter(search=query)
+        .order_by('-search_rank', '-created_at')
+    )
+
+
+def _sqlite_search(queryset, terms):
+    """Match against the FTS5 shadow table and rank by bm25"""
+    match = ' '.join('"%s"*' % term.replace('"', '""') for term in terms)
+    table = Lead._meta.db_table
+    matching_ids = RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,))
+    rank = RawSQL(
+        f'SELECT bm25({FTS_TABLE}) FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = "{table}"."id"',
+        (match,),
+    )
+    return (
+        queryset.filter(id__in=matching_ids)
+        .alias(search_rank=rank)
+        .order_by('search_rank', '-created_at')
+    )
+
+
+def sync_search_index(leads, using='default'):
+    """Refresh the SQLite FTS5 rows for the given leads (no-op elsewhere)"""
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or not leads:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(lead.pk,) for lead in leads],
+        )
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, first_name, last_name, email) VALUES (%s, %s, %s, %s)',
+            [
+                (lead.pk, lead.first_name, lead.last_name, lead.email)
+                for lead in leads if not lead.is_deleted
+            ],
+        )
+
+
+def remove_from_search_index(lead_ids, using='default'):
+    """Drop the SQLite FTS5 rows for the given lead ids (no-op elsewhere)"""
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or not lead_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(lead_id,) for lead_id in lead_ids],
+        )
+
+
+class LeadSearchFilter(filters.SearchFilter):
+    """Ranked prefix search over lead name and email, served by an index"""
+
+    def filter_queryset(self, request, queryset, view):
+        return search_leads(queryset, self.get_search_terms(request))
@@ -1,7 +1,43 @@
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Lead, Activity
+from rest_framework.reverse import reverse
+from .models import Lead, Activity, ArchivedLead
+from .pagination import ActivityCursorPagination
 
-class LeadSerializer(serializers.ModelSerializer):
+
+def validate_budget_range(data):
+    """Reject a minimum budget above the maximum budget"""
+    budget_min = data.get('budget_min')
+    budget_max = data.get('budget_max')
+    
+    if budget_min and budget_max and budget_min > budget_max:
+        raise serializers.ValidationError(
+            "Minimum budget cannot be greater than maximum budget"
+        )
+    
+    return data
+
+def parse_field_list(value):
+    """Split a comma-separated ?fields= / ?omit= value into field names"""
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+class SparseFieldsetMixin:
+    """Serializer mixin that keeps only the fields named in the `fields` argument
+    
+    Meta.field_columns maps computed fields to the model columns they read,
+    so list views can select exactly the columns the kept fields need (see
+    leads.rows.RowSerializer).
+    """
+    
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+class LeadSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Lead model"""
     full_name = serializers.ReadOnlyField()
     budget_range = serializers.ReadOnlyField()
@@ -16,18 +52,14 @@ class LeadSerializer(serializers.ModelSerializer):
             'is_deleted', 'deleted_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'is_active', 'is_deleted', 'deleted_at']
+        field_columns = {
+            'full_name': ('first_name', 'last_name'),
+            'budget_range': ('budget_min', 'budget_max'),
+        }
     
     def validate(self, data):
         """Validate budget range"""
-        budget_min = data.get('budget_min')
-        budget_max = data.get('budget_max')
-        
-        if budget_min and budget_max and budget_min > budget_max:
-            raise serializers.ValidationError(
-                "Minimum budget cannot be greater than maximum budget"
-            )
-        
-        return data
+        return validate_budget_range(data)
 
 class LeadCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating new leads"""
@@ -39,7 +71,40 @@ class LeadCreateSerializer(serializers.ModelSerializer):
             'budget_min', 'budget_max', 'status', 'source', 'property_interest'
         ]
 
-class LeadListSerializer(serializers.ModelSerializer):
+class LeadImportSerializer(LeadCreateSerializer):
+    """Serializer for validating one row of a bulk lead import"""
+    
+    def validate(self, data):
+        """Validate budget range"""
+        return validate_budget_range(data)
+
+class LeadBulkFilterSerializer(serializers.Serializer):
+    """Filter expression for bulk actions, matching the list endpoint's filters"""
+    status = serializers.ChoiceField(choices=Lead.STATUS_CHOICES, required=False)
+    search = serializers.CharField(required=False)
+    
+    def validate(self, data):
+        """Require at least one filter so a bulk action never targets every lead by accident"""
+        if not data:
+            raise serializers.ValidationError("Provide at least one filter")
+        return data
+
+class LeadBulkSelectionSerializer(serializers.Serializer):
+    """Serializer for choosing the leads a bulk action applies to"""
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    filter = LeadBulkFilterSerializer(required=False)
+    
+    def validate(self, data):
+        """Require exactly one of ids or filter"""
+        if ('ids' in data) == ('filter' in data):
+            raise serializers.ValidationError("Provide either ids or filter")
+        return data
+
+class LeadBulkUpdateSerializer(LeadBulkSelectionSerializer):
+    """Serializer for bulk status updates"""
+    status = serializers.ChoiceField(choices=Lead.STATUS_CHOICES)
+
+class LeadListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for lead list view"""
     full_name = serializers.ReadOnlyField()
     budget_range = serializers.ReadOnlyField()
@@ -50,6 +115,15 @@ class LeadListSerializer(serializers.ModelSerializer):
             'id', 'full_name', 'email', 'phone', 'budget_range', 
             'status', 'created_at'
         ]
+        field_columns = LeadSerializer.Meta.field_columns
+
+class ArchivedLeadSerializer(serializers.ModelSerializer):
+    """Serializer for archived leads awaiting restore"""
+    full_name = serializers.ReadOnlyField()
+    
+    class Meta:
+        model = ArchivedLead
+        fields = ['id', 'full_name', 'email', 'status', 'created_at', 'deleted_at', 'archived_at']
 
 
 class ActivitySerializer(serializers.ModelSerializer):
@@ -110,6 +184,12 @@ class ActivitySerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class ActivityListSerializer(ActivitySerializer):
+    """Slim serializer for activity list rows annotated by with_display_names()"""
+    created_by_name = serializers.CharField(read_only=True)
+    lead_name = serializers.CharField(read_only=True)
+
+
 class ActivityCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating new activities"""
     # Accept spec field names while mapping to model fields
@@ -146,17 +226,72 @@ class ActivityCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class ActivityReportQuerySerializer(serializers.Serializer):
+    """Query parameters of the activity report"""
+    period = serializers.ChoiceField(choices=['day', 'week', 'month'], default='day')
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    activity_type = serializers.ChoiceField(choices=Activity.ACTIVITY_TYPE_CHOICES, required=False)
+    user = serializers.IntegerField(required=False)
+    
+    def validate(self, data):
+        """Default to the last 30 days and bound the range"""
+        data.setdefault('end', timezone.localdate())
+        data.setdefault('start', data['end'] - timedelta(days=29))
+        if data['start'] > data['end']:
+            raise serializers.ValidationError("Start cannot be after end")
+        if (data['end'] - data['start']).days >= settings.ACTIVITY_REPORT_MAX_DAYS:
+            raise serializers.ValidationError(
+                f"A report may span at most {settings.ACTIVITY_REPORT_MAX_DAYS} days"
+            )
+        return data
+
+
+class ActivityBatchItemSerializer(ActivityCreateSerializer):
+    """Serializer for one item of a batch, resolving its lead from context['leads']"""
+    lead = serializers.IntegerField()
+    
+    def validate_lead(self, value):
+        """Accept only leads preloaded for the batch (the caller's live leads)"""
+        lead = self.context['leads'].get(value)
+        if lead is None:
+            raise serializers.ValidationError("Lead not found.")
+        return lead
+
+
 class LeadDetailSerializer(serializers.ModelSerializer):
-    """Serializer for Lead detail view with activities"""
+    """Serializer for Lead detail view with its most recent activities"""
     full_name = serializers.ReadOnlyField()
     budget_range = serializers.ReadOnlyField()
-    activities = ActivitySerializer(many=True, read_only=True)
     
     class Meta:
         model = Lead
         fields = [
             'id', 'first_name', 'last_name', 'full_name', 'email', 'phone',
             'budget_min', 'budget_max', 'budget_range', 'status', 'source',
-            'property_interest', 'is_active', 'created_at', 'updated_at', 'activities'
+            'property_interest', 'is_active', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'is_active', 'created_at', 'updated_at']
+    
+    @staticmethod
+    def recent_activities(lead_id):
+        """Return the activities shown on a lead's detail, plus one to detect more"""
+        limit = settings.LEAD_DETAIL_ACTIVITY_LIMIT
+        return Activity.objects.filter(lead_id=lead_id).select_related('lead', 'created_by')[:limit + 1]
+    
+    def to_representation(self, instance):
+        """Add the latest activities in one query, linking to the rest"""
+        data = super().to_representation(instance)
+        limit = settings.LEAD_DETAIL_ACTIVITY_LIMIT
+        # The async detail view fetches these alongside the lead itself.
+        activities = self.context.get('recent_activities')
+        if activities is None:
+            activities = list(instance.activities.select_related('created_by')[:limit + 1])
+        data['activities'] = ActivitySerializer(activities[:limit], many=True, context=self.context).data
+        data['activities_next'] = None
+        if len(activities) > limit:
+            url = reverse('lead-activities', kwargs={'pk': instance.pk}, request=self.context.get('request'))
+            data['activities_next'] = ActivityCursorPagination().get_link_after(
+                f'{url}?limit={limit}', activities[:limit]
+            )
+        return data
@@ -0,0 +1,83 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from .cache import bump_data_version
+from .models import ActivityDailyRollup, Lead, Activity, add_rollup_entry
+from .search import remove_from_search_index, sync_search_index
+
+
+def bump_after_commit(user_id, using):
+    """Bump the user's data version once the current transaction commits"""
+    if user_id is not None:
+        transaction.on_commit(lambda: bump_data_version(user_id), using=using)
+
+
+def activity_owner_id(activity):
+    """Return the id of the user who owns the activity's lead"""
+    if Activity.lead.is_cached(activity):
+        return activity.lead.created_by_id
+    return Lead.objects.filter(pk=activity.lead_id).values_list('created_by_id', flat=True).first()
+
+
+@receiver(post_save, sender=Lead)
+def update_lead_search_index(sender, instance, using, **kwargs):
+    """Keep the search index in step with lead saves and soft deletes"""
+    sync_search_index([instance], using=using)
+
+
+@receiver(post_delete, sender=Lead)
+def remove_lead_search_index(sender, instance, using, **kwargs):
+    """Drop hard-deleted leads from the search index"""
+    remove_from_search_index([instance.pk], using=using)
+
+
+def deletes_model(origin, model):
+    """Return whether a delete() was called on an instance or queryset of the model"""
+    if isinstance(origin, QuerySet):
+        return origin.model is model
+    return isinstance(origin, model)
+
+
+@receiver(pre_delete, sender=Lead)
+def remove_lead_activities_from_rollup(sender, instance, using, **kwargs):
+    """Drop a hard-deleted live lead's activities from the rollup before they cascade"""
+    if not instance.is_deleted:
+        ActivityDailyRollup.objects.using(using).add_lead_activities([instance.pk], sign=-1)
+
+
+@receiver(pre_delete, sender=Activity)
+def remove_activity_from_rollup(sender, instance, using, origin=None, **kwargs):
+    """Drop a deleted activity from the rollup, whether deleted singly or by a queryset
+
+    Activities cascading from a lead delete were removed in one query by
+    remove_lead_activities_from_rollup, and those cascading from a user
+    delete belong to buckets the user's own cascade removes.
+    """
+    if not deletes_model(origin, Activity):
+        return
+    previous = instance._get_stored_rollup_entry(using)
+    if previous and instance._counts_in_rollup():
+        deltas = {}
+        add_rollup_entry(deltas, previous, -1)
+        ActivityDailyRollup.objects.using(using).apply_deltas(deltas)
+
+
+@receiver(post_save, sender=Lead)
+@receiver(post_delete, sender=Lead)
+def invalidate_lead_caches(sender, instance, using, **kwargs):
+    """Invalidate the owner's cached analytics when a lead changes"""
+    bump_after_commit(instance.created_by_id, using)
+
+
+@receiver(post_save, sender=Activity)
+@receiver(post_delete, sender=Activity)
+def invalidate_activity_caches(sender, instance, using, origin=None, **kwargs):
+    """Invalidate the lead owner's cached analytics when an activity changes
+
+    Activities cascading from a lead delete are skipped: the lead's own
+    post_delete bumps the same owner without a lookup per activity.
+    """
+    if deletes_model(origin, Lead):
+        return
+    bump_after_commit(activity_owner_id(instance), using)
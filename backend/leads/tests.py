@@ -0,0 +1,75 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from authentication.models import User
+from .archive import archive_leads
+from .models import Activity, Lead
+
+
+class LeadDetailQueryBudgetTests(TestCase):
+    """Pin the number of queries the lead detail endpoint runs"""
+
+    # The ETag fingerprint, the lead, and the first page of activities with
+    # their display names joined in.
+    QUERY_BUDGET = 3
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='agent', email='agent@example.com', password='pw12345!x', first_name='Ann', last_name='Agent'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.lead = Lead.objects.create(
+            first_name='Lee', last_name='Dean', email='lee@example.com', phone='555-0100',
+            budget_min=Decimal('100000'), budget_max=Decimal('200000'), created_by=self.user,
+        )
+        Activity.objects.bulk_create([
+            Activity(lead=self.lead, activity_type='note', title=f'Note {n}', created_by=self.user)
+            for n in range(50)
+        ])
+
+    def test_retrieve_query_count_does_not_grow_with_activities(self):
+        with self.assertNumQueries(self.QUERY_BUDGET):
+            response = self.client.get(f'/api/leads/{self.lead.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['activities'][0]['lead_name'], 'Lee Dean')
+        self.assertEqual(response.data['activities'][0]['created_by_name'], 'Ann Agent')
+        self.assertIsNotNone(response.data['activities_next'])
+
+
+class ArchiveQueryBudgetTests(TestCase):
+    """Pin archive_leads to a per-batch query count that does not grow with activities"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='agent', email='agent@example.com', password='pw12345!x')
+
+    def make_archivable_lead(self, activities):
+        lead = Lead.objects.create(
+            first_name='Lee', last_name='Dean', email=f'lee{activities}@example.com', phone='555-0100',
+            budget_min=Decimal('100000'), budget_max=Decimal('200000'), created_by=self.user,
+        )
+        Activity.objects.bulk_create([
+            Activity(lead=lead, activity_type='note', title=f'Note {n}', created_by=self.user)
+            for n in range(activities)
+        ])
+        lead.soft_delete()
+        return lead
+
+    def archive(self):
+        return archive_leads(timezone.now() + timedelta(seconds=1))
+
+    def test_query_count_does_not_grow_with_activities(self):
+        self.make_archivable_lead(1)
+        with CaptureQueriesContext(connection) as baseline:
+            self.assertEqual(self.archive(), (1, 1))
+        for activities in (10, 30):
+            with self.subTest(activities=activities):
+                self.make_archivable_lead(activities)
+                with self.assertNumQueries(len(baseline)):
+                    self.assertEqual(self.archive(), (1, activities))
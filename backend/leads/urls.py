@@ -1,4 +1,5 @@
-from django.urls import path, include
+from django.conf import settings
+from django.urls import path, include, re_path
 from rest_framework.routers import DefaultRouter
 from .views import LeadViewSet, ActivityViewSet, dashboard
 
@@ -6,7 +7,19 @@ router = DefaultRouter()
 router.register(r'leads', LeadViewSet)
 router.register(r'activities', ActivityViewSet)
 
-urlpatterns = [
+urlpatterns = []
+if settings.ASYNC_VIEWS:
+    from . import async_views
+    
+    # Shadow the router's routes for the async read paths; everything else,
+    # including format suffixes, still resolves to the sync viewsets below.
+    urlpatterns += [
+        re_path(r'^leads/$', async_views.lead_list, name='lead-list'),
+        re_path(r'^leads/analytics/$', async_views.lead_analytics_view, name='lead-analytics'),
+        re_path(r'^leads/(?P<pk>[0-9]+)/$', async_views.lead_detail, name='lead-detail'),
+        path('dashboard/', async_views.dashboard_view, name='dashboard'),
+    ]
+urlpatterns += [
     path('', include(router.urls)),
     path('dashboard/', dashboard, name='dashboard'),
 ]
@@ -1,34 +1,95 @@
-from rest_framework import viewsets, filters, status
+import tempfile
+import uuid
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db.models import Count, Max
+from django.http import FileResponse, Http404, StreamingHttpResponse
+from rest_framework import viewsets, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Lead, Activity
+from .analytics import get_lead_analytics
+from .archive import RestoreConflict, restore_lead
+from .bulk import (
+    BulkSelectionTooLarge, bulk_create_activities, bulk_soft_delete, bulk_update_status, select_leads
+)
+from .cache import CachedListMixin
+from .conditional import ConditionalGetMixin
+from .exporter import EXPORT_CONTENT_TYPES, EXPORT_FORMATS, stream_leads
+from .filters import ActivityFilter
+from .importer import IMPORT_FORMATS, READERS, ImportFileError, LeadImporter, detect_format
+from .models import Lead, Activity, ActivityDailyRollup, ArchivedLead
+from .pagination import ActivityCursorPagination, LeadCursorPagination
+from .rows import RowListMixin, RowSerializer
+from .search import LeadSearchFilter
 from .serializers import (
-    LeadSerializer, LeadCreateSerializer, LeadDetailSerializer,
-    ActivitySerializer, ActivityCreateSerializer
+    LeadSerializer, LeadCreateSerializer, LeadDetailSerializer, LeadListSerializer, parse_field_list,
+    LeadBulkSelectionSerializer, LeadBulkUpdateSerializer, ArchivedLeadSerializer,
+    ActivitySerializer, ActivityListSerializer, ActivityCreateSerializer,
+    ActivityBatchItemSerializer, ActivityReportQuerySerializer
 )
 
-class LeadViewSet(viewsets.ModelViewSet):
+class LeadViewSet(ConditionalGetMixin, CachedListMixin, RowListMixin, viewsets.ModelViewSet):
     """ViewSet for Lead CRUD operations"""
     queryset = Lead.objects.all()
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, LeadSearchFilter]
     filterset_fields = ['status']
-    search_fields = ['first_name', 'last_name', 'email']
     ordering = ['-created_at']
+    cursor_pagination_class = LeadCursorPagination
     
     def get_queryset(self):
         """Return non-deleted leads for current user"""
         return Lead.objects.filter(is_deleted=False, created_by=self.request.user)
     
+    @property
+    def paginator(self):
+        """Use keyset pagination when the client opts in with ?pagination=cursor"""
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params if self.request else {}
+            if params.get('pagination') == 'cursor' or 'cursor' in params:
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+    
     def get_serializer_class(self):
         """Return serializer based on action"""
         if self.action == 'retrieve':
             return LeadDetailSerializer
         elif self.action == 'create':
             return LeadCreateSerializer
+        elif self.action == 'list' and 'fields' not in self.request.query_params:
+            return LeadListSerializer
         return LeadSerializer
+    
+    def get_list_fields(self):
+        """Return the list fields: the compact set, or ?fields=, less any ?omit="""
+        params = self.request.query_params
+        if 'fields' in params:
+            requested = parse_field_list(params['fields'])
+        else:
+            requested = LeadListSerializer.Meta.fields
+        omitted = parse_field_list(params.get('omit', ''))
+        unknown = sorted(set(requested + omitted) - set(LeadSerializer.Meta.fields))
+        if unknown:
+            raise ValidationError({'fields': [f'Unknown field(s): {", ".join(unknown)}.']})
+        fields = [name for name in requested if name not in omitted]
+        if not fields:
+            raise ValidationError({'fields': ['Select at least one field.']})
+        return fields
+    
+    def get_conditional_aggregates(self):
+        """Fingerprint the lead and its activities for ETags"""
+        return {
+            'updated_at': Max('updated_at'),
+            'activities_updated_at': Max('activities__updated_at'),
+            'activities': Count('activities'),
+        }
 
     def perform_create(self, serializer):
         """Set created_by to current user on lead creation"""
@@ -45,9 +106,7 @@ class LeadViewSet(viewsets.ModelViewSet):
         """Nested activities endpoint: GET list, POST create for lead."""
         lead = self.get_object()
         if request.method.lower() == 'get':
-            queryset = Activity.objects.filter(lead=lead, lead__is_deleted=False).order_by('-date', '-created_at')
-            serializer = ActivitySerializer(queryset, many=True)
-            return Response(serializer.data)
+            return self._activity_timeline(request, lead)
         
         data = request.data.copy()
         data['lead'] = lead.id
@@ -57,66 +116,161 @@ class LeadViewSet(viewsets.ModelViewSet):
         read_serializer = ActivitySerializer(activity)
         return Response(read_serializer.data, status=status.HTTP_201_CREATED)
 
-    @action(detail=False, methods=['get'])
-    def analytics(self, request):
-        """Get analytics data for dashboard"""
-        from django.db.models import Count
+    def _activity_timeline(self, request, lead):
+        """Return one cursor page of the lead's activities, filtered by date range and type"""
+        filterset = ActivityFilter(request.query_params, queryset=Activity.objects.filter(lead=lead), request=request)
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        queryset = filterset.qs.with_display_names()
+        rows = RowSerializer.for_queryset(ActivityListSerializer, queryset)
+        paginator = ActivityCursorPagination()
+        columns = [field.lstrip('-') for field in paginator.ordering]
+        page = paginator.paginate_queryset(rows.values(queryset, *columns), request, view=self)
+        return paginator.get_paginated_response(rows.serialize(page))
+
+    @action(detail=False, methods=['post'], url_path='bulk-update')
+    def bulk_update(self, request):
+        """Set the status of many leads in one statement"""
+        serializer = LeadBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queryset = self._bulk_selection(serializer.validated_data)
+        try:
+            updated = bulk_update_status(queryset, serializer.validated_data['status'], settings.LEAD_BULK_ACTION_LIMIT)
+        except BulkSelectionTooLarge as exc:
+            raise ValidationError(str(exc))
+        return Response({'updated': updated})
+    
+    @action(detail=False, methods=['post'], url_path='bulk-delete')
+    def bulk_delete(self, request):
+        """Soft delete many leads in one statement"""
+        serializer = LeadBulkSelectionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queryset = self._bulk_selection(serializer.validated_data)
+        try:
+            deleted = bulk_soft_delete(queryset, settings.LEAD_BULK_ACTION_LIMIT)
+        except BulkSelectionTooLarge as exc:
+            raise ValidationError(str(exc))
+        return Response({'deleted': deleted})
+    
+    def _bulk_selection(self, data):
+        return select_leads(self.get_queryset(), ids=data.get('ids'), filters=data.get('filter'))
+    
+    @action(detail=False, methods=['get'], url_path='archived')
+    def archived(self, request):
+        """List the user's archived leads, most recently deleted first"""
+        queryset = ArchivedLead.objects.filter(created_by=request.user).order_by('-deleted_at', '-id')
+        page = self.paginate_queryset(queryset)
+        serializer = ArchivedLeadSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
+    @action(detail=False, methods=['post'], url_path=r'archived/(?P<archived_id>[0-9]+)/restore')
+    def restore(self, request, archived_id=None):
+        """Move an archived lead and its activities back to the live tables"""
+        try:
+            archived = ArchivedLead.objects.get(pk=archived_id, created_by=request.user)
+        except ArchivedLead.DoesNotExist:
+            raise Http404
+        try:
+            lead = restore_lead(archived)
+        except ArchivedLead.DoesNotExist:
+            # Restored by a concurrent request.
+            raise Http404
+        except RestoreConflict as exc:
+            return Response({'email': [str(exc)]}, status=status.HTTP_409_CONFLICT)
+        return Response(LeadSerializer(lead).data, status=status.HTTP_201_CREATED)
+    
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_leads(self, request):
+        """Bulk import leads from an uploaded CSV or JSON Lines file"""
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': ['No file was submitted.']})
+        file_format = request.data.get('file_format') or detect_format(upload.name)
+        if file_format not in IMPORT_FORMATS:
+            raise ValidationError({'file_format': [f'Expected one of: {", ".join(IMPORT_FORMATS)}.']})
         
-        total_leads = Lead.objects.filter(is_deleted=False, created_by=request.user).count()
+        with tempfile.TemporaryFile(mode='w+', newline='') as report:
+            importer = LeadImporter(request.user, batch_size=settings.LEAD_IMPORT_BATCH_SIZE, report=report)
+            try:
+                result = importer.run(READERS[file_format](upload))
+            except ImportFileError as exc:
+                raise ValidationError({'file': [str(exc)]})
+            result['error_report'] = None
+            if importer.failed:
+                report_id = uuid.uuid4().hex
+                report.seek(0)
+                default_storage.save(self._import_report_path(report_id), File(report))
+                result['error_report'] = reverse(
+                    'lead-import-report', kwargs={'report_id': report_id}, request=request
+                )
         
-        leads_by_status = (
-            Lead.objects.filter(is_deleted=False, created_by=request.user)
-            .values('status')
-            .annotate(count=Count('id'))
+        return Response(result, status=status.HTTP_201_CREATED if importer.created else status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['get'], url_path=r'import/(?P<report_id>[0-9a-f]{32})')
+    def import_report(self, request, report_id=None):
+        """Download the error report of a previous import"""
+        path = self._import_report_path(report_id)
+        if not default_storage.exists(path):
+            raise Http404
+        return FileResponse(
+            default_storage.open(path, 'rb'), as_attachment=True,
+            filename=f'lead-import-errors-{report_id}.csv', content_type='text/csv',
         )
-        status_data = {item['status']: item['count'] for item in leads_by_status}
-        
-        recent_activities = Activity.objects.filter(
-            lead__is_deleted=False,
-            lead__created_by=request.user,
-        ).select_related('lead', 'created_by').order_by('-created_at')[:10]
-        
-        qualified_leads = Lead.objects.filter(is_deleted=False, status='qualified', created_by=request.user).count()
-        closed_leads = Lead.objects.filter(is_deleted=False, status='closed', created_by=request.user).count()
-        lost_leads = Lead.objects.filter(is_deleted=False, status='lost', created_by=request.user).count()
-        
-        conversion_rate = (closed_leads / total_leads * 100) if total_leads > 0 else 0
-        qualification_rate = (qualified_leads / total_leads * 100) if total_leads > 0 else 0
-        lost_rate = (lost_leads / total_leads * 100) if total_leads > 0 else 0
+    
+    def _import_report_path(self, report_id):
+        return f'lead-imports/{self.request.user.pk}/{report_id}.csv'
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream every matching lead as CSV or NDJSON, optionally with activities"""
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in EXPORT_FORMATS:
+            raise ValidationError({'file_format': [f'Expected one of: {", ".join(EXPORT_FORMATS)}.']})
+        include_activities = request.query_params.get('include_activities', '').lower() in ('1', 'true', 'yes')
+        queryset = self.filter_queryset(self.get_queryset())
         
-        return Response({
-            'total_leads': total_leads,
-            'leads_by_status': status_data,
-            'recent_activities': ActivitySerializer(recent_activities, many=True).data,
-            'conversion_metrics': {
-                'conversion_rate': round(conversion_rate, 1),
-                'qualification_rate': round(qualification_rate, 1),
-                'lost_rate': round(lost_rate, 1),
-                'total_leads': total_leads,
-                'qualified_leads': qualified_leads,
-                'closed_leads': closed_leads,
-                'lost_leads': lost_leads
-            }
-        })
+        response = StreamingHttpResponse(
+            stream_leads(queryset, file_format, include_activities, settings.LEAD_EXPORT_CHUNK_SIZE),
+            content_type=EXPORT_CONTENT_TYPES[file_format],
+        )
+        response['Content-Disposition'] = f'attachment; filename="leads.{file_format}"'
+        return response
+    
+    @action(detail=False, methods=['get'])
+    def analytics(self, request):
+        """Get analytics data for dashboard"""
+        return Response(get_lead_analytics(request.user))
 
-class ActivityViewSet(viewsets.ModelViewSet):
+class ActivityViewSet(ConditionalGetMixin, CachedListMixin, RowListMixin, viewsets.ModelViewSet):
     """ViewSet for Activity CRUD operations"""
     queryset = Activity.objects.all()
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['activity_type', 'lead']
+    filterset_class = ActivityFilter
     ordering = ['-date', '-created_at']
     
     def get_queryset(self):
         """Return activities for non-deleted leads belonging to current user"""
-        return Activity.objects.filter(lead__is_deleted=False, lead__created_by=self.request.user)
+        queryset = Activity.objects.filter(lead__is_deleted=False, lead__created_by=self.request.user)
+        if self.action == 'list':
+            return queryset.with_display_names()
+        return queryset.select_related('lead', 'created_by')
     
     def get_serializer_class(self):
         """Return serializer based on action"""
         if self.action == 'create':
             return ActivityCreateSerializer
+        if self.action == 'list':
+            return ActivityListSerializer
         return ActivitySerializer
     
+    def get_conditional_aggregates(self):
+        """Fingerprint the activity and its lead's name for ETags"""
+        return {
+            'updated_at': Max('updated_at'),
+            'lead_updated_at': Max('lead__updated_at'),
+        }
+    
     def perform_create(self, serializer):
         """Create activity with current user"""
         serializer.save(created_by=self.request.user)
@@ -128,49 +282,81 @@ class ActivityViewSet(viewsets.ModelViewSet):
         activity = create_serializer.save()
         read_serializer = ActivitySerializer(activity)
         return Response(read_serializer.data, status=status.HTTP_201_CREATED)
+    
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """Create a batch of activities across leads, with one result per item in order"""
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError('Expected a list of activities.')
+        if len(items) > settings.ACTIVITY_BATCH_LIMIT:
+            raise ValidationError(f'A batch may contain at most {settings.ACTIVITY_BATCH_LIMIT} activities.')
+        
+        lead_ids = set()
+        for item in items:
+            try:
+                lead_ids.add(int(item.get('lead')))
+            except (AttributeError, TypeError, ValueError):
+                pass
+        leads = Lead.objects.filter(is_deleted=False, created_by=request.user).in_bulk(lead_ids)
+        
+        results = [None] * len(items)
+        pending = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results[index] = {'index': index, 'status': 'error', 'errors': {'non_field_errors': ['Expected an object.']}}
+                continue
+            serializer = ActivityBatchItemSerializer(data=item, context={'request': request, 'leads': leads})
+            if serializer.is_valid():
+                pending.append((index, Activity(created_by=request.user, **serializer.validated_data)))
+            else:
+                results[index] = {'index': index, 'status': 'error', 'errors': serializer.errors}
+        
+        created = bulk_create_activities([activity for _, activity in pending])
+        for (index, _), activity in zip(pending, created):
+            results[index] = {'index': index, 'status': 'created', 'id': activity.pk}
+        
+        if not pending and items:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif len(pending) < len(items):
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_201_CREATED
+        return Response(results, status=response_status)
+    
+    @action(detail=False, methods=['get'])
+    def report(self, request):
+        """Activity counts and minutes per agent and type, by day, week or month, from the daily rollup"""
+        query = ActivityReportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        rollups = ActivityDailyRollup.objects.filter(day__gte=params['start'], day__lte=params['end'])
+        # Staff see every agent (or the one in ?user=); everyone else sees their own activity.
+        if not request.user.is_staff:
+            rollups = rollups.filter(user=request.user)
+        elif 'user' in params:
+            rollups = rollups.filter(user_id=params['user'])
+        if 'activity_type' in params:
+            rollups = rollups.filter(activity_type=params['activity_type'])
+        return Response({
+            'period': params['period'],
+            'start': params['start'],
+            'end': params['end'],
+            'results': [
+                {
+                    'period': row['period'],
+                    'user': row['user_id'],
+                    'activity_type': row['activity_type'],
+                    'count': row['count'],
+                    'duration_minutes': row['duration_minutes'],
+                }
+                for row in rollups.series(params['period'])
+            ],
+        })
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def dashboard(request):
     """Dashboard metrics endpoint."""
-    from django.db.models import Count
-
-    total_leads = Lead.objects.filter(is_deleted=False, created_by=request.user).count()
-
-    leads_by_status = (
-        Lead.objects.filter(is_deleted=False, created_by=request.user)
-        .values('status')
-        .annotate(count=Count('id'))
-    )
-    status_data = {item['status']: item['count'] for item in leads_by_status}
-
-    recent_activities = (
-        Activity.objects.filter(lead__is_deleted=False, lead__created_by=request.user)
-        .select_related('lead', 'created_by')
-        .order_by('-created_at')[:10]
-    )
-
-    qualified_leads = Lead.objects.filter(is_deleted=False, status='qualified', created_by=request.user).count()
-    closed_leads = Lead.objects.filter(is_deleted=False, status='closed', created_by=request.user).count()
-    lost_leads = Lead.objects.filter(is_deleted=False, status='lost', created_by=request.user).count()
-
-    total_leads_safe = total_leads if total_leads > 0 else 0
-    conversion_rate = (closed_leads / total_leads * 100) if total_leads > 0 else 0
-    qualification_rate = (qualified_leads / total_leads * 100) if total_leads > 0 else 0
-    lost_rate = (lost_leads / total_leads * 100) if total_leads > 0 else 0
-
-    return Response({
-        'total_leads': total_leads_safe,
-        'leads_by_status': status_data,
-        'recent_activities': ActivitySerializer(recent_activities, many=True).data,
-        'conversion_metrics': {
-            'conversion_rate': round(conversion_rate, 1),
-            'qualification_rate': round(qualification_rate, 1),
-            'lost_rate': round(lost_rate, 1),
-            'total_leads': total_leads,
-            'qualified_leads': qualified_leads,
-            'closed_leads': closed_leads,
-            'lost_leads': lost_leads
-        }
-    })
+    return Response(get_lead_analytics(request.user))
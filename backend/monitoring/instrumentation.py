@@ -0,0 +1,71 @@
+import time
+from contextvars import ContextVar
+
+_active_recorders = ContextVar('monitoring_query_recorders', default=())
+
+
+class QueryRecorder:
+    """Collects the SQL run while handling one request, on any thread
+
+    Recorders nest: every active recorder sees each statement, so the
+    profiler and the metrics middleware can both watch one request.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration(self):
+        return sum(duration for _, duration in self.queries)
+
+    def __enter__(self):
+        self._token = _active_recorders.set(_active_recorders.get() + (self,))
+        return self
+
+    def __exit__(self, *exc_info):
+        _active_recorders.reset(self._token)
+
+    def slowest(self, limit):
+        """Return the `limit` slowest statements as dicts"""
+        queries = sorted(self.queries, key=lambda query: query[1], reverse=True)[:limit]
+        return [{'sql': sql, 'ms': round(duration * 1000, 2)} for sql, duration in queries]
+
+    def repeated(self, limit):
+        """Return statements run more than once, most repeated first"""
+        counts = {}
+        for sql, duration in self.queries:
+            count, total = counts.get(sql, (0, 0))
+            counts[sql] = (count + 1, total + duration)
+        repeated = sorted(
+            ((sql, count, total) for sql, (count, total) in counts.items() if count > 1),
+            key=lambda item: item[1], reverse=True,
+        )[:limit]
+        return [{'sql': sql, 'count': count, 'ms': round(total * 1000, 2)} for sql, count, total in repeated]
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper that times statements for the active recorders"""
+    recorders = _active_recorders.get()
+    if not recorders:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        for recorder in recorders:
+            recorder.queries.append((sql, duration))
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """connection_created receiver that wraps every new connection with record_query
+
+    Recorders live in a context variable, which asgiref copies into the
+    worker threads of async views, so their queries are counted too.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
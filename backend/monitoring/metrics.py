@@ -0,0 +1,120 @@
+import threading
+from collections import defaultdict
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+REGISTRY = []
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter per label set, in the Prometheus text format"""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = defaultdict(int)
+        self.lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def inc(self, *labels, amount=1):
+        with self.lock:
+            self.values[labels] += amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self.lock:
+            for labels, value in sorted(self.values.items()):
+                lines.append(f'{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}')
+        return lines
+
+
+class Histogram:
+    """Cumulative histogram per label set, in the Prometheus text format"""
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.series = {}
+        self.lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, *labels, value):
+        with self.lock:
+            series = self.series.setdefault(labels, {'buckets': [0] * len(self.buckets), 'sum': 0, 'count': 0})
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['buckets'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self.lock:
+            for labels, series in sorted(self.series.items()):
+                for bound, bucket_count in zip(self.buckets, series['buckets']):
+                    bucket_labels = _format_labels(self.labelnames, labels, [('le', _format_number(float(bound)))])
+                    lines.append(f'{self.name}_bucket{bucket_labels} {bucket_count}')
+                inf_labels = _format_labels(self.labelnames, labels, [('le', '+Inf')])
+                lines.append(f'{self.name}_bucket{inf_labels} {series["count"]}')
+                lines.append(f'{self.name}_sum{_format_labels(self.labelnames, labels)} {float(series["sum"])!r}')
+                lines.append(f'{self.name}_count{_format_labels(self.labelnames, labels)} {series["count"]}')
+        return lines
+
+
+
+def render_metrics():
+    """Return every registered metric in the Prometheus text exposition format"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+REQUESTS = Counter(
+    'http_requests_total', 'Requests handled, by view, method and status code',
+    ('view', 'method', 'status'),
+)
+SLOW_REQUESTS = Counter(
+    'http_slow_requests_total', 'Requests slower than SLOW_REQUEST_MS, by view',
+    ('view',),
+)
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'Time to produce the response, by view and method',
+    ('view', 'method'),
+)
+DB_DURATION = Histogram(
+    'http_request_db_duration_seconds', 'Time spent in SQL per request, by view',
+    ('view',),
+)
+DB_QUERIES = Histogram(
+    'http_request_db_queries', 'SQL statements executed per request, by view',
+    ('view',), buckets=QUERY_BUCKETS,
+)
+RENDER_DURATION = Histogram(
+    'http_response_render_seconds', 'Time spent rendering the response body, by view',
+    ('view',),
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', 'Size of non-streaming response bodies, by view',
+    ('view',), buckets=SIZE_BUCKETS,
+)
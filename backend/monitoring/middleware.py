@@ -0,0 +1,97 @@
+import json
+import logging
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from . import metrics
+from .instrumentation import QueryRecorder
+
+logger = logging.getLogger('monitoring.slow_requests')
+
+
+class RequestMetricsMiddleware:
+    """Record SQL count, database time, render time and size for API requests
+
+    Each measured response gets a Server-Timing header and feeds the
+    histograms served at /metrics; requests slower than SLOW_REQUEST_MS are
+    logged as JSON with their slowest and most repeated SQL.
+    """
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.is_measured(request):
+            return self.get_response(request)
+        started = time.perf_counter()
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        self.record(request, response, recorder, time.perf_counter() - started)
+        return response
+    
+    async def __acall__(self, request):
+        if not self.is_measured(request):
+            return await self.get_response(request)
+        started = time.perf_counter()
+        with QueryRecorder() as recorder:
+            response = await self.get_response(request)
+        self.record(request, response, recorder, time.perf_counter() - started)
+        return response
+    
+    def is_measured(self, request):
+        return request.path.startswith(tuple(settings.REQUEST_METRICS_PATHS))
+    
+    def process_template_response(self, request, response):
+        """Time the rendering of DRF responses, which happens after the view returns"""
+        started = time.perf_counter()
+        
+        def finished(rendered):
+            request._metrics_render_time = time.perf_counter() - started
+        
+        response.add_post_render_callback(finished)
+        return response
+    
+    def record(self, request, response, recorder, duration):
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        render_time = getattr(request, '_metrics_render_time', None)
+        size = None if response.streaming else len(response.content)
+        
+        metrics.REQUESTS.inc(view, request.method, str(response.status_code))
+        metrics.REQUEST_DURATION.observe(view, request.method, value=duration)
+        metrics.DB_QUERIES.observe(view, value=recorder.count)
+        metrics.DB_DURATION.observe(view, value=recorder.duration)
+        if render_time is not None:
+            metrics.RENDER_DURATION.observe(view, value=render_time)
+        if size is not None:
+            metrics.RESPONSE_SIZE.observe(view, value=size)
+        
+        timings = [f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"']
+        if render_time is not None:
+            timings.append(f'render;dur={render_time * 1000:.1f}')
+        timings.append(f'total;dur={duration * 1000:.1f}')
+        response['Server-Timing'] = ', '.join(timings)
+        
+        if duration * 1000 >= settings.SLOW_REQUEST_MS:
+            metrics.SLOW_REQUESTS.inc(view)
+            logger.warning(json.dumps({
+                'event': 'slow_request',
+                'view': view,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'duration_ms': round(duration * 1000, 2),
+                'db_ms': round(recorder.duration * 1000, 2),
+                'render_ms': round(render_time * 1000, 2) if render_time is not None else None,
+                'queries': recorder.count,
+                'response_bytes': size,
+                'slowest_sql': recorder.slowest(settings.SLOW_REQUEST_SQL_LIMIT),
+                'repeated_sql': recorder.repeated(settings.SLOW_REQUEST_SQL_LIMIT),
+            }))
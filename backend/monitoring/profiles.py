@@ -0,0 +1,86 @@
+import io
+import json
+import os
+import pstats
+import uuid
+from pathlib import Path
+from django.conf import settings
+
+PROFILE_ID_PATTERN = r'[0-9a-f]{32}'
+
+
+class ProfileStore:
+    """Keep the newest PROFILE_STORE_MAX_FILES request profiles on disk
+
+    Each profile is a JSON report (request summary, cumulative call listing
+    with callees, SQL list) plus the raw cProfile dump for tools like snakeviz.
+    """
+    
+    def __init__(self, directory=None, max_profiles=None):
+        self.directory = Path(directory or settings.PROFILE_STORE_DIR)
+        self.max_profiles = max_profiles or settings.PROFILE_STORE_MAX_FILES
+    
+    def report_path(self, profile_id):
+        return self.directory / f'{profile_id}.json'
+    
+    def dump_path(self, profile_id):
+        return self.directory / f'{profile_id}.prof'
+    
+    def save(self, summary, profiler, recorder):
+        """Write a profile and prune the oldest beyond the limit; return its id"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile_id = uuid.uuid4().hex
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream).sort_stats('cumulative')
+        stats.print_stats(settings.PROFILE_REPORT_LINES)
+        stats.print_callees(settings.PROFILE_REPORT_LINES)
+        report = {
+            'id': profile_id,
+            **summary,
+            'queries': recorder.count,
+            'db_ms': round(recorder.duration * 1000, 2),
+            'sql': [{'sql': sql, 'ms': round(duration * 1000, 2)} for sql, duration in recorder.queries],
+            'call_tree': stream.getvalue(),
+        }
+        profiler.dump_stats(self.dump_path(profile_id))
+        # Write then rename, so readers never see a half-written report.
+        temporary = self.directory / f'.{profile_id}.json.tmp'
+        temporary.write_text(json.dumps(report))
+        os.replace(temporary, self.report_path(profile_id))
+        self.prune()
+        return profile_id
+    
+    def prune(self):
+        for path in self._reports()[self.max_profiles:]:
+            path.unlink(missing_ok=True)
+            self.dump_path(path.stem).unlink(missing_ok=True)
+    
+    def list(self):
+        """Return the summaries of stored profiles, newest first"""
+        summaries = []
+        for path in self._reports():
+            report = self._read(path)
+            if report is not None:
+                summaries.append({key: value for key, value in report.items() if key not in ('sql', 'call_tree')})
+        return summaries
+    
+    def get(self, profile_id):
+        """Return a full report, or None when it no longer exists"""
+        return self._read(self.report_path(profile_id))
+    
+    def _reports(self):
+        if not self.directory.is_dir():
+            return []
+        paths = []
+        for path in self.directory.glob('*.json'):
+            try:
+                paths.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        return [path for _, path in sorted(paths, reverse=True)]
+    
+    def _read(self, path):
+        try:
+            return json.loads(path.read_text())
+        except (FileNotFoundError, ValueError):
+            return None
@@ -0,0 +1,111 @@
+import asyncio
+import cProfile
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.utils import timezone
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.reverse import reverse
+from rest_framework.settings import api_settings
+from .instrumentation import QueryRecorder
+from .profiles import ProfileStore
+
+# cProfile hooks the whole event loop thread, and a second enable() would
+# take over (or on Python 3.12+ refuse) the first request's profiler.
+_async_profiling_lock = asyncio.Lock()
+
+
+def profiling_requested(request):
+    return request.headers.get('X-Profile', '').lower() in ('1', 'true') or request.GET.get('profile') == '1'
+
+
+def request_user(request):
+    """Return the session or API user behind a request, or None"""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user
+    drf_request = Request(request)
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            result = authentication_class().authenticate(drf_request)
+        except APIException:
+            return None
+        if result is not None:
+            return result[0]
+    return None
+
+
+class ProfilingMiddleware:
+    """Profile single requests from staff users who send X-Profile: 1 or ?profile=1
+
+    The request runs under cProfile with its SQL captured, the report is
+    kept in the ProfileStore, and the response carries X-Profile-Id and
+    X-Profile-Url headers pointing at it. Other requests only pay for the
+    header check. Under ASGI the call tree covers the event loop thread,
+    so it can include other requests' coroutines; the SQL list does not.
+    The loop has one profiler slot, so only one async request is profiled
+    at a time: a profiling request that overlaps another runs unprofiled
+    and says so in an X-Profile-Skipped header.
+    """
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        user = self.staff_user(request) if profiling_requested(request) else None
+        if user is None:
+            return self.get_response(request)
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        with QueryRecorder() as recorder:
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        return self.store(request, user, response, profiler, recorder, time.perf_counter() - started)
+    
+    async def __acall__(self, request):
+        user = await sync_to_async(self.staff_user)(request) if profiling_requested(request) else None
+        if user is None:
+            return await self.get_response(request)
+        if _async_profiling_lock.locked():
+            response = await self.get_response(request)
+            response['X-Profile-Skipped'] = 'Another request is being profiled'
+            return response
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        async with _async_profiling_lock:
+            with QueryRecorder() as recorder:
+                profiler.enable()
+                try:
+                    response = await self.get_response(request)
+                finally:
+                    profiler.disable()
+        return await sync_to_async(self.store)(
+            request, user, response, profiler, recorder, time.perf_counter() - started
+        )
+    
+    def staff_user(self, request):
+        user = request_user(request)
+        return user if user is not None and user.is_staff else None
+    
+    def store(self, request, user, response, profiler, recorder, duration):
+        profile_id = ProfileStore().save({
+            'created_at': timezone.now().isoformat(),
+            'user': user.get_username(),
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+        }, profiler, recorder)
+        response['X-Profile-Id'] = profile_id
+        response['X-Profile-Url'] = reverse('profile-detail', kwargs={'profile_id': profile_id}, request=request)
+        return response
@@ -0,0 +1,8 @@
+from django.urls import re_path
+from .profiles import PROFILE_ID_PATTERN
+from .views import ProfileDetailView, ProfileListView
+
+urlpatterns = [
+    re_path(r'^$', ProfileListView.as_view(), name='profile-list'),
+    re_path(rf'^(?P<profile_id>{PROFILE_ID_PATTERN})/$', ProfileDetailView.as_view(), name='profile-detail'),
+]
@@ -0,0 +1,53 @@
+import hmac
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .metrics import render_metrics
+from .profiles import ProfileStore
+
+
+def metrics_view(request):
+    """Serve request metrics for Prometheus to scrape
+
+    Requires `Authorization: Bearer <METRICS_TOKEN>`; with no token configured
+    the endpoint is only available when DEBUG is on.
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            raise Http404
+    elif not settings.DEBUG:
+        raise Http404
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class ProfileListView(APIView):
+    """List stored request profiles, newest first"""
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        return Response(ProfileStore().list())
+
+
+class ProfileDetailView(APIView):
+    """Return one profile report, or its raw cProfile dump with ?download=1"""
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request, profile_id):
+        store = ProfileStore()
+        report = store.get(profile_id)
+        if report is None:
+            raise Http404
+        if request.query_params.get('download') == '1':
+            try:
+                dump = open(store.dump_path(profile_id), 'rb')
+            except FileNotFoundError:
+                raise Http404
+            return FileResponse(
+                dump, as_attachment=True,
+                filename=f'profile-{profile_id}.prof', content_type='application/octet-stream',
+            )
+        return Response(report)